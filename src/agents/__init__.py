@@ -63,6 +63,16 @@ GREEN_HAT_TASK_TEMPLATES = CTO_TASK_TEMPLATES
 
 # === Agent Factory Functions ===
 
+# Role name -> factory, built once at import (new names + backward compatible aliases)
+_AGENT_FACTORIES = {
+    "white_hat": create_architect_agent,
+    "architect": create_architect_agent,
+    "black_hat": create_auditor_agent,
+    "auditor": create_auditor_agent,
+    "green_hat": create_cto_agent,
+    "cto": create_cto_agent,
+}
+
 
 def create_deep_spec_crew(
     verbose: bool = True,
@@ -145,20 +155,11 @@ def create_agent_by_role(
         >>> auditor = create_agent_by_role("auditor")
         >>> cto = create_agent_by_role("cto", allow_delegation=True)
     """
-    role_mapping = {
-        "white_hat": create_architect_agent,
-        "architect": create_architect_agent,
-        "black_hat": create_auditor_agent,
-        "auditor": create_auditor_agent,
-        "green_hat": create_cto_agent,
-        "cto": create_cto_agent,
-    }
-
-    agent_func = role_mapping.get(role)
+    agent_func = _AGENT_FACTORIES.get(role)
     if not agent_func:
         raise ValueError(
             f"Role không tồn tại: '{role}'. "
-            f"Các roles có sẵn: {list(role_mapping.keys())}"
+            f"Các roles có sẵn: {list(_AGENT_FACTORIES.keys())}"
         )
 
     return agent_func(verbose, memory, allow_delegation)
@@ -166,6 +167,15 @@ def create_agent_by_role(
 
 # === Task Template Factory ===
 
+_TASK_TEMPLATE_GETTERS = {
+    "white_hat": get_architect_task_template,
+    "architect": get_architect_task_template,
+    "black_hat": get_auditor_task_template,
+    "auditor": get_auditor_task_template,
+    "green_hat": get_cto_task_template,
+    "cto": get_cto_task_template,
+}
+
 
 def get_task_template(
     agent_role: Literal["white_hat", "black_hat", "green_hat", "architect", "auditor", "cto"],
@@ -195,20 +205,11 @@ def get_task_template(
         ...     requirements="..."
         ... )
     """
-    role_mapping = {
-        "white_hat": get_architect_task_template,
-        "architect": get_architect_task_template,
-        "black_hat": get_auditor_task_template,
-        "auditor": get_auditor_task_template,
-        "green_hat": get_cto_task_template,
-        "cto": get_cto_task_template,
-    }
-
-    template_func = role_mapping.get(agent_role)
+    template_func = _TASK_TEMPLATE_GETTERS.get(agent_role)
     if not template_func:
         raise ValueError(
             f"Role không tồn tại: '{agent_role}'. "
-            f"Các roles có sẵn: {list(role_mapping.keys())}"
+            f"Các roles có sẵn: {list(_TASK_TEMPLATE_GETTERS.keys())}"
         )
 
     return template_func(template_name)
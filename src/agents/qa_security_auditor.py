@@ -9,7 +9,9 @@ Agent này đại diện cho sự hoài nghi và kiểm tra nghiêm ngặt trong
 Nó đóng vai trò "người ủng hộ quỷ dữ" để thách thức các giả định và tìm lỗ hổng.
 """
 
-from crewai import Agent
+from typing import Optional
+
+from crewai import LLM, Agent
 from src.utils.llm_provider import get_agent_llm
 
 # Import tools
@@ -33,6 +35,7 @@ def create_black_hat_agent(
     memory: bool = True,
     allow_delegation: bool = False,
     enable_tools: bool = True,
+    llm: Optional[LLM] = None,
 ) -> Agent:
     """
     Tạo và cấu hình Agent QA & Security Auditor (Black Hat).
@@ -54,6 +57,8 @@ def create_black_hat_agent(
         memory: Bật memory để lưu ngữ cảnh (mặc định: True)
         allow_delegation: Cho phép agent ủy quyền task (mặc định: False)
         enable_tools: Bật tools cho agent (mặc định: True)
+        llm: LLM dùng chung khi tạo nhiều auditors (mặc định: LLM khuyến nghị
+            cho vai trò black_hat)
 
     Returns:
         Agent: Instance của QA & Security Auditor Agent đã được cấu hình
@@ -65,7 +70,8 @@ def create_black_hat_agent(
         'Chuyên gia Kiểm thử & Bảo mật (Black Hat)'
     """
     # Get optimized LLM for BlackHat role (higher temperature for creative problem-finding)
-    llm = get_agent_llm("black_hat")
+    if llm is None:
+        llm = get_agent_llm("black_hat")
 
     # Configure tools for the auditor
     tools = []
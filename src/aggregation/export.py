@@ -91,15 +91,18 @@ def export_sdd(
     filename = f"{aggregated_data['feature_name'].replace(' ', '_')}_{status}_{timestamp}.{format}"
     full_path = Path(output_path) / filename
 
-    full_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(full_path, 'w', encoding='utf-8') as f:
-        f.write(final_content)
+    try:
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(final_content)
+    except FileNotFoundError:
+        # Thư mục output chưa tồn tại (thường chỉ lần export đầu): tạo rồi ghi lại
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(final_content)
 
     # Save quality report JSON
     report_path = Path(output_path) / f"{full_path.stem}_quality_report.json"
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(quality_report.model_dump(), f, indent=2)
+    report_path.write_bytes(_dump_json_bytes(quality_report.model_dump()))
 
     return {
         "file_path": str(full_path),
@@ -108,6 +111,30 @@ def export_sdd(
     }
 
 
+def _dump_json_bytes(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize data thành JSON (indent 2) dạng bytes UTF-8, ưu tiên orjson.
+
+    Ký tự non-ASCII (tiếng Việt) được ghi nguyên dạng UTF-8 thay vì escape
+    \\uXXXX; fallback json chuẩn dùng ensure_ascii=False để hai nhánh cho
+    cùng format.
+    """
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        # orjson nhanh hơn nhiều; kiểu nó không hỗ trợ (số nguyên > 64-bit,
+        # key không phải str) thì rơi về thư viện json chuẩn
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 def inject_quality_gate_badge(content: str, report: QualityGateReport) -> str:
     """Inject Quality Gate report badge vào document."""
     badge = f"""
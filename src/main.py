@@ -8,10 +8,10 @@ if project_root not in sys.path:
 
 import argparse
 from crewai import Agent, Task, Crew, LLM
-from dotenv import load_dotenv
+from src.utils.llm_provider import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Import hierarchical workflow components
 # Note: Phase 4 (Aggregation & Publishing) runs automatically within hierarchical workflow
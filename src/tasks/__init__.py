@@ -5,6 +5,7 @@ from src.tasks.task_definitions import (
     BusinessExceptionsTaskDefinition,
     TechnicalEdgeCasesTaskDefinition,
     create_hierarchical_tasks,
+    create_hierarchical_tasks_async,
 )
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "BusinessExceptionsTaskDefinition",
     "TechnicalEdgeCasesTaskDefinition",
     "create_hierarchical_tasks",
+    "create_hierarchical_tasks_async",
 ]
@@ -6,9 +6,16 @@ vì Manager Agent sẽ quyết định task nào chạy và truyền context.
 Tuy nhiên, tasks vẫn cần description rõ ràng để Manager hiểu dependencies.
 """
 
-from typing import List
-from crewai import Task
-from src.schemas import HappyPath, StressTestReport
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Task
+
+# crewai.Task và src.schemas được import trong từng create() để import
+# package src.tasks không kéo theo chi phí build Pydantic schema.
 
 
 class HappyPathTaskDefinition:
@@ -20,6 +27,13 @@ class HappyPathTaskDefinition:
     2. Truyền kết quả cho các tasks sau
     """
 
+    __slots__ = ()
+
+    EXPECTED_OUTPUT = (
+        "HappyPath object với: feature_id, feature_name, description, "
+        "steps (list of FlowStep), pre_conditions, post_conditions, business_value"
+    )
+
     @staticmethod
     def create(
         user_requirement: str,
@@ -35,6 +49,9 @@ class HappyPathTaskDefinition:
         Returns:
             Task: CrewAI Task với output_pydantic=HappyPath
         """
+        from crewai import Task
+        from src.schemas import HappyPath
+
         return Task(
             description=f"""
             PHASE 1: Thiết kế Happy Path cho feature:
@@ -48,10 +65,7 @@ class HappyPathTaskDefinition:
 
             Output format: HappyPath Pydantic object
             """,
-            expected_output=(
-                "HappyPath object với: feature_id, feature_name, description, "
-                "steps (list of FlowStep), pre_conditions, post_conditions, business_value"
-            ),
+            expected_output=HappyPathTaskDefinition.EXPECTED_OUTPUT,
             agent=architect_agent,
             output_pydantic=HappyPath,
         )
@@ -64,6 +78,13 @@ class BusinessExceptionsTaskDefinition:
     Manager sẽ chạy task này SAU HappyPathTask và truyền kết quả happy path.
     """
 
+    __slots__ = ()
+
+    EXPECTED_OUTPUT = (
+        "StressTestReport object với: report_id, happy_path_id, feature_name, "
+        "edge_cases (5+ EdgeCase về business rules), resilience_score, coverage_score"
+    )
+
     @staticmethod
     def create(
         user_requirement: str,
@@ -81,6 +102,9 @@ class BusinessExceptionsTaskDefinition:
         Returns:
             Task: CrewAI Task với output_pydantic=StressTestReport
         """
+        from crewai import Task
+        from src.schemas import StressTestReport
+
         return Task(
             description=f"""
             PHASE 2: Phân tích Business Rule Exceptions cho feature:
@@ -99,10 +123,7 @@ class BusinessExceptionsTaskDefinition:
 
             Output format: StressTestReport Pydantic object (business exceptions only)
             """,
-            expected_output=(
-                "StressTestReport object với: report_id, happy_path_id, feature_name, "
-                "edge_cases (5+ EdgeCase về business rules), resilience_score, coverage_score"
-            ),
+            expected_output=BusinessExceptionsTaskDefinition.EXPECTED_OUTPUT,
             agent=auditor_agent,
             output_pydantic=StressTestReport,
             context=[happy_path_task],  # Hierarchical: Manager sẽ truyền context
@@ -116,6 +137,13 @@ class TechnicalEdgeCasesTaskDefinition:
     Manager sẽ chạy task này SAU cả 2 tasks trước và truyền kết quả cả hai.
     """
 
+    __slots__ = ()
+
+    EXPECTED_OUTPUT = (
+        "StressTestReport object với: report_id, happy_path_id, feature_name, "
+        "edge_cases (5+ EdgeCase về technical issues), resilience_score, coverage_score"
+    )
+
     @staticmethod
     def create(
         user_requirement: str,
@@ -135,6 +163,9 @@ class TechnicalEdgeCasesTaskDefinition:
         Returns:
             Task: CrewAI Task với output_pydantic=StressTestReport
         """
+        from crewai import Task
+        from src.schemas import StressTestReport
+
         return Task(
             description=f"""
             PHASE 3: Stress Test Kỹ Thuật cho feature:
@@ -153,10 +184,7 @@ class TechnicalEdgeCasesTaskDefinition:
 
             Output format: StressTestReport Pydantic object (technical edge cases only)
             """,
-            expected_output=(
-                "StressTestReport object với: report_id, happy_path_id, feature_name, "
-                "edge_cases (5+ EdgeCase về technical issues), resilience_score, coverage_score"
-            ),
+            expected_output=TechnicalEdgeCasesTaskDefinition.EXPECTED_OUTPUT,
             agent=auditor_agent,
             output_pydantic=StressTestReport,
             context=[happy_path_task, business_exceptions_task],
@@ -167,7 +195,7 @@ def create_hierarchical_tasks(
     user_requirement: str,
     architect_agent,
     auditor_agent,
-) -> List[Task]:
+) -> list[Task]:
     """
     Factory function để tạo tất cả tasks cho hierarchical workflow.
 
@@ -182,7 +210,7 @@ def create_hierarchical_tasks(
         auditor_agent: Auditor agent (Black Hat)
 
     Returns:
-        List[Task]: 3 tasks theo thứ tự recommended execution
+        list[Task]: 3 tasks theo thứ tự recommended execution
     """
     # Task 1: Happy Path (Foundation)
     happy_path_task = HappyPathTaskDefinition.create(
@@ -212,9 +240,43 @@ def create_hierarchical_tasks(
     ]
 
 
+async def create_hierarchical_tasks_async(
+    user_requirement: str,
+    architect_agent,
+    auditor_agent,
+) -> list[Task]:
+    """
+    Async version của create_hierarchical_tasks().
+
+    3 tasks trong một bộ phụ thuộc nhau qua context nên vẫn được tạo tuần tự;
+    việc khởi tạo Task (Pydantic validation) chạy trong worker thread để nhiều
+    requirements có thể được tạo song song:
+
+        >>> task_lists = await asyncio.gather(*[
+        ...     create_hierarchical_tasks_async(r, architect, auditor)
+        ...     for r in requirements
+        ... ])
+
+    Args:
+        user_requirement: Feature description từ user
+        architect_agent: Architect agent (White Hat)
+        auditor_agent: Auditor agent (Black Hat)
+
+    Returns:
+        list[Task]: 3 tasks theo thứ tự recommended execution
+    """
+    return await asyncio.to_thread(
+        create_hierarchical_tasks,
+        user_requirement=user_requirement,
+        architect_agent=architect_agent,
+        auditor_agent=auditor_agent,
+    )
+
+
 __all__ = [
     "HappyPathTaskDefinition",
     "BusinessExceptionsTaskDefinition",
     "TechnicalEdgeCasesTaskDefinition",
     "create_hierarchical_tasks",
+    "create_hierarchical_tasks_async",
 ]
@@ -0,0 +1,56 @@
+"""
+Shared HTTP session for Deep-Spec AI tools
+
+Một requests.Session duy nhất cho web_fetcher và các search providers, để
+các lần gọi tái sử dụng kết nối TCP/TLS (keep-alive) thay vì bắt tay lại.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+
+# User-Agent mặc định cho mọi request qua session dùng chung
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# Tạo lazily để các module tools vẫn import được khi chưa cài requests
+_SESSION: Optional["requests.Session"] = None
+
+
+def get_session() -> "requests.Session":
+    """
+    Lấy (hoặc tạo) requests.Session dùng chung.
+
+    Session có connection pool, retry cho lỗi kết nối và 429/502/503/504,
+    và User-Agent mặc định.
+
+    Raises:
+        ImportError: Nếu chưa cài requests
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                # 429: chờ theo Retry-After (nếu có) rồi thử lại với backoff
+                status_forcelist=[429, 502, 503, 504],
+                raise_on_status=False,  # trả response cuối, để caller raise_for_status
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        _SESSION = session
+    return _SESSION
@@ -11,13 +11,23 @@ These tools help agents understand existing codebases, documentation,
 and configuration when designing system architectures.
 """
 
+import fnmatch
+import mmap
 import os
-from typing import Optional, List
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Iterator, Optional, List, Tuple
 from pathlib import Path
 
 from crewai.tools import tool
 
 
+# Dòng heading "# " hoặc "## " đầu tiên (cho phép whitespace đầu/cuối dòng)
+_MARKDOWN_TITLE_RE = re.compile(r'^[^\S\n]*#{1,2} [^\S\n]*(\S.*?)[^\S\n]*$', re.MULTILINE)
+
+
 @tool("Read File - Đọc File")
 def read_file(file_path: str, encoding: str = "utf-8") -> str:
     """
@@ -57,6 +67,34 @@ def read_file(file_path: str, encoding: str = "utf-8") -> str:
         ) from e
 
 
+# Ngôn ngữ theo phần mở rộng (lowercase) cho read_code_file
+_EXTENSION_MAP = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'JavaScript JSX',
+    '.tsx': 'TypeScript JSX',
+    '.java': 'Java',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.c': 'C',
+    '.cpp': 'C++',
+    '.h': 'C/C++ Header',
+    '.hpp': 'C++ Header',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.sql': 'SQL',
+    '.sh': 'Shell',
+    '.bash': 'Bash',
+    '.yaml': 'YAML',
+    '.yml': 'YAML',
+    '.json': 'JSON',
+    '.xml': 'XML',
+    '.md': 'Markdown',
+}
+
+
 @tool("Read Code File - Đọc File Code")
 def read_code_file(file_path: str, language: Optional[str] = None) -> str:
     """
@@ -91,32 +129,7 @@ def read_code_file(file_path: str, language: Optional[str] = None) -> str:
 
     # Auto-detect language from extension
     if language is None:
-        extension_map = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.jsx': 'JavaScript JSX',
-            '.tsx': 'TypeScript JSX',
-            '.java': 'Java',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.c': 'C',
-            '.cpp': 'C++',
-            '.h': 'C/C++ Header',
-            '.hpp': 'C++ Header',
-            '.html': 'HTML',
-            '.css': 'CSS',
-            '.scss': 'SCSS',
-            '.sql': 'SQL',
-            '.sh': 'Shell',
-            '.bash': 'Bash',
-            '.yaml': 'YAML',
-            '.yml': 'YAML',
-            '.json': 'JSON',
-            '.xml': 'XML',
-            '.md': 'Markdown',
-        }
-        language = extension_map.get(path.suffix, 'Unknown')
+        language = _EXTENSION_MAP.get(path.suffix.lower(), 'Unknown')
 
     try:
         with open(path, 'r', encoding='utf-8') as f:
@@ -167,18 +180,11 @@ def read_markdown_file(file_path: str) -> str:
     with open(path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Extract title if exists (first # heading)
-    title = "Không có tiêu đề"
-    for line in content.split('\n'):
-        line = line.strip()
-        if line.startswith('# '):
-            title = line[2:].strip()
-            break
-        elif line.startswith('## '):
-            title = line[3:].strip()
-            break
+    # Extract title if exists (first # or ## heading)
+    title_match = _MARKDOWN_TITLE_RE.search(content)
+    title = title_match.group(1) if title_match else "Không có tiêu đề"
 
-    lines_count = len(content.split('\n'))
+    lines_count = content.count('\n') + 1
     words_count = len(content.split())
 
     return f"""# Markdown File: {file_path}
@@ -208,8 +214,6 @@ def read_json_file(file_path: str, pretty: bool = True) -> str:
         >>> data = read_json_file("/path/to/config.json")
         >>> print(data)
     """
-    import json
-
     path = Path(file_path)
 
     if not path.exists():
@@ -218,10 +222,48 @@ def read_json_file(file_path: str, pretty: bool = True) -> str:
     if path.suffix != '.json':
         raise ValueError(f"File không phải là JSON: {file_path}")
 
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    return _format_json_file(file_path, *_file_cache_key(path), pretty)
+
+
+# Dãy chữ số đủ dài để có thể vượt int 64-bit (orjson không giữ được chính xác)
+_LONG_DIGIT_RUN_RE = re.compile(rb'\d{19,}')
+
+
+def _loads_json(raw: bytes):
+    """
+    Parse JSON, dùng orjson khi có và an toàn, ngược lại dùng json chuẩn.
+
+    orjson đổi số nguyên lớn hơn 64-bit sang float (mất chính xác), nên input có
+    dãy chữ số dài đi thẳng qua json chuẩn. NaN/Infinity và các input orjson
+    từ chối cũng rơi về json chuẩn.
+    """
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
 
-    formatted = json.dumps(data, indent=2 if pretty else None, ensure_ascii=False)
+    if orjson is not None and _LONG_DIGIT_RUN_RE.search(raw) is None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+
+    import json
+
+    return json.loads(raw.decode('utf-8'))
+
+
+@lru_cache(maxsize=128)
+def _format_json_file(file_path: str, resolved_path: str, mtime_ns: int, size: int, pretty: bool) -> str:
+    """Parse + format file JSON, cache theo (path, mtime, size)."""
+    with open(resolved_path, 'rb') as f:
+        raw = f.read()
+
+    import json
+
+    # Format bằng json.dumps để output giữ nguyên như trước (separators,
+    # cách viết số float); orjson.dumps viết khác (vd. 1e22 thay vì 1e+22)
+    formatted = json.dumps(_loads_json(raw), indent=2 if pretty else None, ensure_ascii=False)
 
     return f"""# JSON File: {file_path}
 
@@ -258,12 +300,19 @@ def read_yaml_file(file_path: str) -> str:
     if path.suffix not in ['.yaml', '.yml']:
         raise ValueError(f"File không phải là YAML: {file_path}")
 
-    with open(path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    return _format_yaml_file(file_path, *_file_cache_key(path))
 
-    # Convert to formatted string
-    import json
-    formatted = json.dumps(data, indent=2, ensure_ascii=False)
+
+@lru_cache(maxsize=128)
+def _format_yaml_file(file_path: str, resolved_path: str, mtime_ns: int, size: int) -> str:
+    """Parse + format file YAML, cache theo (path, mtime, size)."""
+    import yaml
+
+    # libyaml C loader nếu có, cùng semantics với yaml.safe_load
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    with open(resolved_path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=loader)
 
     return f"""# YAML File: {file_path}
 
@@ -308,27 +357,40 @@ def list_directory(directory_path: str, pattern: Optional[str] = None, recursive
     if not files:
         return f"# Thư mục: {directory_path}\n\nKhông tìm thấy file nào."
 
-    result = f"# Thư mục: {directory_path}"
+    header = f"# Thư mục: {directory_path}"
     if pattern:
-        result += f" (Pattern: {pattern})"
-    result += f"\n\nTìm thấy {len(files)} file:\n\n"
+        header += f" (Pattern: {pattern})"
+    parts = [f"{header}\n\nTìm thấy {len(files)} file:\n\n"]
+
+    # Group by extension, chỉ sort từng nhóm một lần khi xuất
+    by_extension = defaultdict(list)
+    for file in files:
+        by_extension[file.suffix or 'no_extension'].append(file.relative_to(path))
+
+    for ext in sorted(by_extension):
+        file_list = sorted(by_extension[ext])
+        parts.append(f"## {ext or 'Không có phần mở rộng'} ({len(file_list)} files)\n\n")
+        parts.extend(f"- `{rel_path}`\n" for rel_path in file_list)
+        parts.append("\n")
+
+    return "".join(parts)
+
 
-    # Group by extension
-    by_extension = {}
-    for file in sorted(files):
-        ext = file.suffix or 'no_extension'
-        if ext not in by_extension:
-            by_extension[ext] = []
-        by_extension[ext].append(str(file))
+def _file_cache_key(path: Path) -> Tuple[str, int, int]:
+    """
+    Key cache cho file đã parse: (resolved path, mtime_ns, size).
+
+    File bị sửa sẽ đổi mtime/size nên cache entry cũ tự động bị bỏ qua.
+    """
+    stat = path.stat()
+    return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
 
-    for ext, file_list in sorted(by_extension.items()):
-        result += f"## {ext or 'Không có phần mở rộng'} ({len(file_list)} files)\n\n"
-        for file_path in file_list:
-            rel_path = os.path.relpath(file_path, directory_path)
-            result += f"- `{rel_path}`\n"
-        result += "\n"
 
-    return result
+# Số bytes đầu file dùng để nhận diện file binary trong search_in_files
+_BINARY_SNIFF_BYTES = 512
+
+# Số thread đọc file song song trong search_in_files (I/O-bound)
+_SEARCH_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 
 @tool("Search in Files - Tìm trong Files")
@@ -359,57 +421,203 @@ def search_in_files(
     if not path.exists():
         raise FileNotFoundError(f"Thư mục không tồn tại: {directory_path}")
 
-    search_term_cmp = search_term if case_sensitive else search_term.lower()
+    # Kết quả được báo theo từng dòng, nên search_term chứa '\n' không bao giờ
+    # khớp; bỏ qua luôn thay vì để search trên cả buffer khớp xuyên dòng
+    if '\n' in search_term:
+        return f"# Tìm kiếm: '{search_term}' trong {directory_path}\n\nKhông tìm thấy kết quả."
+
+    byte_matcher = _compile_byte_matcher(search_term, case_sensitive)
+    line_matcher = re.compile(re.escape(search_term), 0 if case_sensitive else re.IGNORECASE)
 
     results = []
     files_searched = 0
 
-    for file_path in path.rglob(pattern if pattern else "*"):
-        if not file_path.is_file():
-            continue
-
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            content_cmp = content if case_sensitive else content.lower()
-
-            if search_term_cmp in content_cmp:
-                files_searched += 1
-                lines = content.split('\n')
-                matches = []
-
-                for i, line in enumerate(lines, 1):
-                    line_cmp = line if case_sensitive else line.lower()
-                    if search_term_cmp in line_cmp:
-                        # Truncate line if too long
-                        display_line = line.strip()
-                        if len(display_line) > 100:
-                            display_line = display_line[:97] + "..."
-                        matches.append(f"  Line {i}: {display_line}")
-
-                if matches:
-                    rel_path = os.path.relpath(file_path, directory_path)
-                    results.append(f"## File: {rel_path}\n")
-                    results.append(f"Tìm thấy {len(matches)} kết quả:\n")
-                    results.extend(matches[:10])  # Max 10 matches per file
-                    if len(matches) > 10:
-                        results.append(f"  ... và {len(matches) - 10} kết quả khác")
-                    results.append("\n")
-
-        except Exception as e:
-            continue
+    # Đọc + scan từng file trong thread pool: read() nhả GIL nên I/O của
+    # nhiều file được overlap. executor.map giữ nguyên thứ tự file.
+    candidates = list(_iter_files(directory_path, pattern))
+    scan = partial(_scan_file, byte_matcher=byte_matcher, line_matcher=line_matcher)
+
+    with ThreadPoolExecutor(max_workers=_SEARCH_MAX_WORKERS) as executor:
+        scanned = executor.map(scan, (file_path for file_path, _ in candidates))
+        for (_, rel_path), matches in zip(candidates, scanned):
+            if not matches:
+                continue
+
+            files_searched += 1
+            results.append(f"## File: {rel_path}\n")
+            results.append(f"Tìm thấy {len(matches)} kết quả:\n")
+            results.extend(matches[:10])  # Max 10 matches per file
+            if len(matches) > 10:
+                results.append(f"  ... và {len(matches) - 10} kết quả khác")
+            results.append("\n")
 
     if not results:
         return f"# Tìm kiếm: '{search_term}' trong {directory_path}\n\nKhông tìm thấy kết quả."
 
-    output = f"# Tìm kiếm: '{search_term}' trong {directory_path}"
+    header = f"# Tìm kiếm: '{search_term}' trong {directory_path}"
     if pattern:
-        output += f" (Pattern: {pattern})"
-    output += f"\n\nTìm thấy trong {files_searched} file:\n\n"
-    output += "".join(results)
+        header += f" (Pattern: {pattern})"
+
+    return "".join([f"{header}\n\nTìm thấy trong {files_searched} file:\n\n", *results])
+
+
+def _iter_files(root: str, pattern: Optional[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Duyệt đệ quy thư mục bằng os.scandir, trả về (path, relative path) của các file khớp pattern.
+
+    Thứ tự giống Path.rglob (thư mục cha trước, thư mục con theo chiều sâu).
+    DirEntry đã có sẵn loại entry nên không cần stat thêm cho từng file như rglob.
+    Pattern không có '/' được so với tên file; có '/' thì so từng segment của
+    đường dẫn tương đối với '**/' + pattern, giống rglob.
+    """
+    if pattern is None:
+        matches = None
+    elif '/' in pattern:
+        # So từng segment như rglob: '*' không khớp qua '/', nên 'src/*.py'
+        # không khớp 'src/sub/deep.py'; '**' khớp 0 hoặc nhiều thư mục
+        pattern_parts = ('**', *(part for part in pattern.split('/') if part))
+        matches = lambda name, rel: _match_segments(tuple(rel.split(os.sep)), pattern_parts)
+    else:
+        name_re = re.compile(fnmatch.translate(pattern))
+        matches = lambda name, rel: name_re.match(name) is not None
+
+    stack = [(root, '')]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, rel + os.sep))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if matches is None or matches(entry.name, rel):
+                yield entry.path, rel
+
+        stack.extend(reversed(subdirs))
+
+
+def _match_segments(parts: Tuple[str, ...], pattern_parts: Tuple[str, ...]) -> bool:
+    """Khớp path segments với pattern segments như glob: '**' khớp 0 hoặc nhiều segment."""
+    if not pattern_parts:
+        return not parts
+    head, rest = pattern_parts[0], pattern_parts[1:]
+    if head == '**':
+        return any(_match_segments(parts[i:], rest) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], head) and _match_segments(parts[1:], rest)
+
+
+def _scan_file(
+    file_path: str,
+    byte_matcher: Optional["re.Pattern[bytes]"],
+    line_matcher: "re.Pattern[str]",
+) -> Optional[List[str]]:
+    """
+    Scan một file cho search_in_files.
+
+    Returns:
+        List[str] các dòng match, hoặc None nếu không đọc được
+    """
+    try:
+        # mmap file và loại nhanh file không chứa search_term trên raw bytes,
+        # chỉ decode sang str khi có khả năng match
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Bỏ qua file binary: có byte NUL trong 512 bytes đầu (heuristic của Git)
+                if mm.find(b'\x00', 0, _BINARY_SNIFF_BYTES) != -1:
+                    return None
+                if byte_matcher is not None and byte_matcher.search(mm) is None:
+                    return None
+                content = str(mm, 'utf-8', 'ignore')
+
+        return _find_matching_lines(content, line_matcher)
+    except Exception:
+        return None
+
+
+def _compile_byte_matcher(search_term: str, case_sensitive: bool) -> Optional["re.Pattern[bytes]"]:
+    """
+    Tạo regex trên bytes để loại nhanh file không chứa search_term.
+
+    Regex bytes với re.IGNORECASE chỉ fold chữ ASCII, nên search_term có ký tự
+    non-ASCII và không phân biệt hoa thường sẽ không có fast path (trả về None).
+    """
+    needle = re.escape(search_term.encode('utf-8'))
+    if case_sensitive:
+        return re.compile(needle)
+    if search_term.isascii():
+        return re.compile(needle, re.IGNORECASE)
+    return None
 
-    return output
+
+def _find_matching_lines(content: str, line_matcher: "re.Pattern[str]") -> List[str]:
+    """
+    Trả về các dòng (đã format) chứa match, theo thứ tự xuất hiện.
+
+    Nhảy thẳng từ match này sang dòng kế tiếp thay vì split toàn bộ file,
+    nên chi phí Python tỉ lệ với số match chứ không phải số dòng.
+    """
+    matches = []
+    line_number = 1
+    counted_to = 0
+    content_length = len(content)
+
+    match = line_matcher.search(content)
+    while match is not None:
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        line_end = content.find('\n', match.start())
+        if line_end == -1:
+            line_end = content_length
+
+        line_number += content.count('\n', counted_to, line_start)
+        counted_to = line_start
+
+        # Truncate line if too long
+        display_line = content[line_start:line_end].strip()
+        if len(display_line) > 100:
+            display_line = display_line[:97] + "..."
+        matches.append(f"  Line {line_number}: {display_line}")
+
+        if line_end >= content_length:
+            break
+        match = line_matcher.search(content, line_end + 1)
+
+    return matches
+
+
+# Loại file theo phần mở rộng khi ReadFileTool.run(file_type="auto")
+_AUTO_FILE_TYPES = {
+    '.md': "markdown",
+    '.json': "json",
+    '.yaml': "yaml",
+    '.yml': "yaml",
+    '.py': "code",
+    '.js': "code",
+    '.ts': "code",
+    '.java': "code",
+    '.go': "code",
+    '.rs': "code",
+    '.c': "code",
+    '.cpp': "code",
+}
+
+# Tool đọc file theo file_type; loại khác rơi về read_file
+_FILE_TYPE_READERS = {
+    "markdown": read_markdown_file,
+    "json": read_json_file,
+    "yaml": read_yaml_file,
+    "code": read_code_file,
+}
 
 
 # CrewAI Tool class for backward compatibility
@@ -423,6 +631,8 @@ class ReadFileTool:
         >>> result = tool.run("/path/to/file.txt")
     """
 
+    __slots__ = ('tools',)
+
     def __init__(self):
         self.tools = [
             read_file,
@@ -446,23 +656,7 @@ class ReadFileTool:
             str: Nội dung file
         """
         if file_type == "auto":
-            suffix = Path(file_path).suffix
-            if suffix == '.md':
-                file_type = "markdown"
-            elif suffix == '.json':
-                file_type = "json"
-            elif suffix in ['.yaml', '.yml']:
-                file_type = "yaml"
-            elif suffix in ['.py', '.js', '.ts', '.java', '.go', '.rs', '.c', '.cpp']:
-                file_type = "code"
-
-        if file_type == "markdown":
-            return read_markdown_file.run(file_path)
-        elif file_type == "json":
-            return read_json_file.run(file_path)
-        elif file_type == "yaml":
-            return read_yaml_file.run(file_path)
-        elif file_type == "code":
-            return read_code_file.run(file_path)
-        else:
-            return read_file.run(file_path)
+            file_type = _AUTO_FILE_TYPES.get(Path(file_path).suffix.lower(), file_type)
+
+        reader = _FILE_TYPE_READERS.get(file_type, read_file)
+        return reader.run(file_path)
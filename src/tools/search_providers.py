@@ -8,7 +8,9 @@ Supports multiple search providers:
 - DuckDuckGo (free, no API key required)
 """
 
+import importlib.util
 import os
+from functools import lru_cache
 from typing import Optional, List
 from abc import ABC, abstractmethod
 
@@ -16,6 +18,8 @@ from abc import ABC, abstractmethod
 class SearchProvider(ABC):
     """Base class for search providers."""
 
+    __slots__ = ()
+
     @abstractmethod
     def search(
         self,
@@ -44,13 +48,19 @@ class SearchProvider(ABC):
 class WebSearchPrimeProvider(SearchProvider):
     """Sử dụng MCP Web Search Prime provider."""
 
+    __slots__ = ('_client', 'available')
+
     def __init__(self):
-        try:
+        # Chỉ kiểm tra package đã cài chưa; import thật khi search lần đầu
+        self.available = importlib.util.find_spec("mcp_web_search_prime") is not None
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
             from mcp_web_search_prime import webSearchPrime
-            self.client = webSearchPrime
-            self.available = True
-        except ImportError:
-            self.available = False
+            self._client = webSearchPrime
+        return self._client
 
     def search(
         self,
@@ -87,7 +97,7 @@ class WebSearchPrimeProvider(SearchProvider):
 
     def _format_results(self, results: dict, max_results: int) -> str:
         """Format search results."""
-        output = f"# Kết quả tìm kiếm\n\n"
+        header = "# Kết quả tìm kiếm\n\n"
 
         if isinstance(results, dict):
             items = results.get('data', []) if 'data' in results else []
@@ -95,29 +105,29 @@ class WebSearchPrimeProvider(SearchProvider):
             items = []
 
         if not items:
-            return output + "Không tìm thấy kết quả."
+            return header + "Không tìm thấy kết quả."
 
+        parts = [header]
         for i, item in enumerate(items[:max_results], 1):
-            output += f"## Kết quả {i}\n\n"
+            parts.append(f"## Kết quả {i}\n\n")
 
             if isinstance(item, dict):
                 title = item.get('title', 'Không có tiêu đề')
                 url = item.get('url', '')
                 snippet = item.get('snippet', item.get('summary', ''))
                 source = item.get('website_name', item.get('source', ''))
-                icon = item.get('website_icon', '')
 
-                output += f"**Tiêu đề**: {title}\n\n"
-                output += f"**Nguồn**: {source}\n\n"
-                output += f"**Link**: {url}\n\n"
+                parts.append(f"**Tiêu đề**: {title}\n\n")
+                parts.append(f"**Nguồn**: {source}\n\n")
+                parts.append(f"**Link**: {url}\n\n")
                 if snippet:
-                    output += f"**Mô tả**: {snippet}\n\n"
+                    parts.append(f"**Mô tả**: {snippet}\n\n")
             else:
-                output += f"{item}\n\n"
+                parts.append(f"{item}\n\n")
 
-            output += "---\n\n"
+            parts.append("---\n\n")
 
-        return output
+        return "".join(parts)
 
 
 class DuckDuckGoProvider(SearchProvider):
@@ -126,13 +136,19 @@ class DuckDuckGoProvider(SearchProvider):
     Sử dụng duckduckgo_search library.
     """
 
+    __slots__ = ('_client', 'available')
+
     def __init__(self):
-        try:
+        # Chỉ kiểm tra package đã cài chưa; import thật khi search lần đầu
+        self.available = importlib.util.find_spec("duckduckgo_search") is not None
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
             from duckduckgo_search import DDGS
-            self.client = DDGS()
-            self.available = True
-        except ImportError:
-            self.available = False
+            self._client = DDGS()
+        return self._client
 
     def search(
         self,
@@ -166,19 +182,22 @@ class DuckDuckGoProvider(SearchProvider):
 
     def _format_results(self, results: List[dict]) -> str:
         """Format DuckDuckGo search results."""
-        output = f"# Kết quả tìm kiếm DuckDuckGo\n\n"
+        header = "# Kết quả tìm kiếm DuckDuckGo\n\n"
 
         if not results:
-            return output + "Không tìm thấy kết quả."
+            return header + "Không tìm thấy kết quả."
 
+        parts = [header]
         for i, item in enumerate(results, 1):
-            output += f"## Kết quả {i}\n\n"
-            output += f"**Tiêu đề**: {item.get('title', 'Không có tiêu đề')}\n\n"
-            output += f"**Link**: {item.get('link', '')}\n\n"
-            output += f"**Mô tả**: {item.get('body', '')}\n\n"
-            output += "---\n\n"
+            parts.append(
+                f"## Kết quả {i}\n\n"
+                f"**Tiêu đề**: {item.get('title', 'Không có tiêu đề')}\n\n"
+                f"**Link**: {item.get('link', '')}\n\n"
+                f"**Mô tả**: {item.get('body', '')}\n\n"
+                "---\n\n"
+            )
 
-        return output
+        return "".join(parts)
 
 
 class GoogleCustomSearchProvider(SearchProvider):
@@ -187,6 +206,8 @@ class GoogleCustomSearchProvider(SearchProvider):
     Cần API key và Custom Search Engine ID.
     """
 
+    __slots__ = ('api_key', 'cse_id', 'available')
+
     def __init__(self, api_key: Optional[str] = None, cse_id: Optional[str] = None):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         self.cse_id = cse_id or os.getenv("GOOGLE_CSE_ID")
@@ -204,7 +225,7 @@ class GoogleCustomSearchProvider(SearchProvider):
             raise ValueError("Google CSE requires GOOGLE_API_KEY and GOOGLE_CSE_ID environment variables")
 
         try:
-            import requests
+            from src.tools._http import get_session
 
             url = "https://www.googleapis.com/customsearch/v1"
             params = {
@@ -220,7 +241,7 @@ class GoogleCustomSearchProvider(SearchProvider):
                 time_map = {"d": "d1", "w": "w1", "m": "m1", "y": "y1"}
                 params["dateRestrict"] = time_map.get(time_range, "")
 
-            response = requests.get(url, params=params, timeout=10)
+            response = get_session().get(url, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -231,29 +252,53 @@ class GoogleCustomSearchProvider(SearchProvider):
 
     def _format_results(self, data: dict) -> str:
         """Format Google CSE results."""
-        output = f"# Kết quả tìm kiếm Google\n\n"
+        header = "# Kết quả tìm kiếm Google\n\n"
 
         items = data.get("items", [])
 
         if not items:
-            return output + "Không tìm thấy kết quả."
+            return header + "Không tìm thấy kết quả."
 
+        parts = [header]
         for i, item in enumerate(items, 1):
-            output += f"## Kết quả {i}\n\n"
-            output += f"**Tiêu đề**: {item.get('title', 'Không có tiêu đề')}\n\n"
-            output += f"**Link**: {item.get('link', '')}\n\n"
-            output += f"**Mô tả**: {item.get('snippet', '')}\n\n"
-            output += "---\n\n"
+            parts.append(
+                f"## Kết quả {i}\n\n"
+                f"**Tiêu đề**: {item.get('title', 'Không có tiêu đề')}\n\n"
+                f"**Link**: {item.get('link', '')}\n\n"
+                f"**Mô tả**: {item.get('snippet', '')}\n\n"
+                "---\n\n"
+            )
+
+        return "".join(parts)
+
 
-        return output
+# Tên provider -> class, dùng cho get_search_provider
+_PROVIDERS = {
+    "web_search_prime": WebSearchPrimeProvider,
+    "duckduckgo": DuckDuckGoProvider,
+    "google": GoogleCustomSearchProvider,
+}
 
+# Thứ tự ưu tiên khi tự động phát hiện
+_AUTO_DETECT_ORDER = (
+    WebSearchPrimeProvider,
+    DuckDuckGoProvider,
+    GoogleCustomSearchProvider,
+)
 
+
+@lru_cache(maxsize=8)
 def get_search_provider(provider_name: Optional[str] = None) -> SearchProvider:
     """
     Lấy search provider. Tự động phát hiện nếu không chỉ định.
 
+    Kết quả được cache theo provider_name, nên việc phát hiện provider chỉ chạy
+    một lần mỗi process. Gọi get_search_provider.cache_clear() sau khi đổi
+    biến môi trường hoặc cài thêm package.
+
     Args:
-        provider_name: Tên provider ("web_search_prime", "duckduckgo", "google")
+        provider_name: Tên provider ("web_search_prime", "duckduckgo", "google").
+            Nếu None, dùng biến môi trường DEEPSPEC_SEARCH_PROVIDER (nếu có).
 
     Returns:
         SearchProvider: Instance của search provider
@@ -261,15 +306,11 @@ def get_search_provider(provider_name: Optional[str] = None) -> SearchProvider:
     Raises:
         ValueError: Nếu không có provider nào available
     """
+    provider_name = provider_name or os.getenv("DEEPSPEC_SEARCH_PROVIDER")
+
     # Try specified provider first
     if provider_name:
-        providers = {
-            "web_search_prime": WebSearchPrimeProvider,
-            "duckduckgo": DuckDuckGoProvider,
-            "google": GoogleCustomSearchProvider,
-        }
-
-        provider_class = providers.get(provider_name.lower())
+        provider_class = _PROVIDERS.get(provider_name.lower())
         if provider_class:
             instance = provider_class()
             if instance.available:
@@ -278,13 +319,7 @@ def get_search_provider(provider_name: Optional[str] = None) -> SearchProvider:
                 raise ValueError(f"Provider '{provider_name}' không available. Kiểm tra dependencies/API keys.")
 
     # Auto-detect: try in order of preference
-    providers_to_try = [
-        WebSearchPrimeProvider,
-        DuckDuckGoProvider,
-        GoogleCustomSearchProvider,
-    ]
-
-    for provider_class in providers_to_try:
+    for provider_class in _AUTO_DETECT_ORDER:
         try:
             instance = provider_class()
             if instance.available:
@@ -6,11 +6,112 @@ Supports static pages and basic JavaScript-rendered content.
 """
 
 import re
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Tuple
 from urllib.parse import urlparse, urljoin
 
 from crewai.tools import tool
 
+from src.tools._http import get_session
+
+
+# Class của div chứa nội dung chính (fallback khi không có <main>/<article>)
+_CONTENT_CLASS_RE = re.compile(r'content|main|article|post', re.IGNORECASE)
+
+# Content-Type được parse trong fetch_and_parse_url
+_TEXT_CONTENT_TYPES = ('html', 'xml', 'text/')
+
+# Số bytes tối thiểu tải về cho một trang (phần <head>, script inline... có
+# thể chiếm hàng trăm KB trước nội dung chính)
+_MIN_FETCH_BYTES = 256 * 1024
+
+# Cache cho conditional GET (LRU): url -> (ETag, body). Được gọi từ nhiều
+# threads (probe README song song) nên mọi truy cập đi qua _ETAG_CACHE_LOCK
+_ETAG_CACHE: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+_ETAG_CACHE_MAX_ENTRIES = 128
+_ETAG_CACHE_LOCK = threading.Lock()
+
+
+def _conditional_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = 10,
+    max_bytes: Optional[int] = None,
+    content_types: Optional[Tuple[str, ...]] = None,
+):
+    """
+    GET qua session dùng chung (src.tools._http), gửi If-None-Match nếu đã có ETag cho URL.
+
+    Args:
+        url: URL cần GET
+        headers: Header bổ sung
+        timeout: Timeout (giây)
+        max_bytes: Nếu có, stream response và chỉ đọc tối đa chừng này bytes
+        content_types: Nếu có, không đọc body khi Content-Type không chứa
+            chuỗi nào trong danh sách (body trả về rỗng)
+
+    Returns:
+        Tuple[Response, bytes]: response và body. Khi server trả 304, body là
+        nội dung đã cache từ lần trước.
+    """
+    request_headers = dict(headers) if headers else {}
+    with _ETAG_CACHE_LOCK:
+        cached = _ETAG_CACHE.get(url)
+        if cached:
+            _ETAG_CACHE.move_to_end(url)
+    if cached:
+        request_headers['If-None-Match'] = cached[0]
+
+    stream = max_bytes is not None or content_types is not None
+    response = get_session().get(url, headers=request_headers, timeout=timeout, stream=stream)
+
+    if response.status_code == 304 and cached:
+        response.close()
+        return response, cached[1]
+
+    if not stream:
+        content = response.content
+        complete = True
+    else:
+        with response:
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_types is not None and content_type and not any(t in content_type for t in content_types):
+                return response, b''
+            content, complete = _read_capped(response, max_bytes)
+
+    etag = response.headers.get('ETag')
+    # Body bị cắt thì không cache, tránh trả về bản thiếu khi gặp 304 lần sau
+    if response.status_code == 200 and etag and complete:
+        with _ETAG_CACHE_LOCK:
+            _ETAG_CACHE[url] = (etag, content)
+            _ETAG_CACHE.move_to_end(url)
+            while len(_ETAG_CACHE) > _ETAG_CACHE_MAX_ENTRIES:
+                _ETAG_CACHE.popitem(last=False)  # bỏ entry ít dùng nhất
+
+    return response, content
+
+
+def _read_capped(response, max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """
+    Đọc body của streamed response, dừng khi đủ max_bytes.
+
+    Returns:
+        Tuple[bytes, bool]: body và cờ đã đọc hết response hay chưa
+    """
+    if max_bytes is None:
+        return response.content, True
+
+    chunks = []
+    total = 0
+    for chunk in response.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= max_bytes:
+            return b''.join(chunks)[:max_bytes], False
+    return b''.join(chunks), True
+
 
 def fetch_and_parse_url(url: str, max_length: int = 5000) -> str:
     """
@@ -29,21 +130,33 @@ def fetch_and_parse_url(url: str, max_length: int = 5000) -> str:
     """
     try:
         import requests
-        from bs4 import BeautifulSoup
+        from bs4 import BeautifulSoup, FeatureNotFound
     except ImportError as e:
         return _error_message(str(e))
 
     try:
-        # Fetch the page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=10)
+        # Fetch the page (User-Agent mặc định đã đặt ở session dùng chung).
+        # Chỉ tải phần đầu trang đủ cho max_length ký tự text, bỏ qua body
+        # của response không phải HTML/text.
+        response, body = _conditional_get(
+            url,
+            timeout=10,
+            max_bytes=max(max_length * 8, _MIN_FETCH_BYTES),
+            content_types=_TEXT_CONTENT_TYPES,
+        )
         response.raise_for_status()
 
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        content_type = response.headers.get('Content-Type', '')
+        if response.status_code != 304 and content_type and not any(
+            t in content_type.lower() for t in _TEXT_CONTENT_TYPES
+        ):
+            return f"# Không hỗ trợ\n\n{url} không phải trang HTML/text (Content-Type: {content_type})."
+
+        # Parse HTML (lxml là C parser, nhanh hơn nhiều; fallback html.parser nếu chưa cài)
+        try:
+            soup = BeautifulSoup(body, 'lxml')
+        except FeatureNotFound:
+            soup = BeautifulSoup(body, 'html.parser')
 
         # Remove script and style elements
         for script in soup(["script", "style", "nav", "footer", "header"]):
@@ -57,7 +170,7 @@ def fetch_and_parse_url(url: str, max_length: int = 5000) -> str:
         main_content = (
             soup.find('main') or
             soup.find('article') or
-            soup.find('div', class_=re.compile(r'content|main|article|post', re.I)) or
+            soup.find('div', class_=_CONTENT_CLASS_RE) or
             soup.body
         )
 
@@ -130,33 +243,41 @@ def fetch_github_readme(repo_url: str) -> str:
 
     owner, repo = path_parts[0], path_parts[1]
 
-    # Try different README filenames
-    readme_names = ['README.md', 'README.MD', 'readme.md', 'Readme.md']
+    # GitHub REST API trả README của default branch trong một request
+    api_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
+    try:
+        response, content = _conditional_get(
+            api_url, headers={'Accept': 'application/vnd.github.raw'}, timeout=10
+        )
+        if response.status_code in (200, 304):
+            return f"# README: {owner}/{repo}\n\n" + content.decode('utf-8', errors='replace')
+    except Exception:
+        pass
 
-    for readme_name in readme_names:
-        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/main/{readme_name}"
+    # Fallback (API rate limit, lỗi API...): probe song song các raw URLs,
+    # chọn kết quả theo thứ tự ưu tiên main -> master, README.md -> ...
+    readme_names = ['README.md', 'README.MD', 'readme.md', 'Readme.md']
+    raw_urls = [
+        f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{readme_name}"
+        for branch in ('main', 'master')
+        for readme_name in readme_names
+    ]
 
-        try:
-            response = requests.get(raw_url, timeout=10)
-            if response.status_code == 200:
-                content = response.text
-                return f"# README: {owner}/{repo}\n\n" + content
-        except Exception:
-            continue
+    with ThreadPoolExecutor(max_workers=len(raw_urls)) as executor:
+        for content in executor.map(_probe_readme_url, raw_urls):
+            if content is not None:
+                return f"# README: {owner}/{repo}\n\n" + content.decode('utf-8', errors='replace')
 
-    # Try master branch if main failed
-    for readme_name in readme_names:
-        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/master/{readme_name}"
+    return f"# Không tìm thấy README\n\nKhông tìm thấy README trong repository: {repo_url}"
 
-        try:
-            response = requests.get(raw_url, timeout=10)
-            if response.status_code == 200:
-                content = response.text
-                return f"# README: {owner}/{repo}\n\n" + content
-        except Exception:
-            continue
 
-    return f"# Không tìm thấy README\n\nKhông tìm thấy README trong repository: {repo_url}"
+def _probe_readme_url(raw_url: str) -> Optional[bytes]:
+    """Thử tải một raw README URL, trả về body hoặc None nếu không có."""
+    try:
+        response, content = _conditional_get(raw_url, timeout=10)
+    except Exception:
+        return None
+    return content if response.status_code in (200, 304) else None
 
 
 def _error_message(missing_dependency: str) -> str:
@@ -183,6 +304,8 @@ class WebFetcher:
         >>> content = fetcher.fetch("https://example.com")
     """
 
+    __slots__ = ('available',)
+
     def __init__(self):
         try:
             import requests
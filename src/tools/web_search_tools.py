@@ -14,12 +14,72 @@ These tools help agents research:
 """
 
 import os
-from typing import Optional, List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List, Tuple
 from datetime import datetime
 
 from crewai.tools import tool
 
 
+# Số nguồn tối đa được tìm song song trong search_with_sources
+_MAX_SOURCE_WORKERS = 8
+
+# Giới hạn số search request đồng thời trong cả process (nhiều agent có thể
+# gọi tool cùng lúc), tránh vượt rate limit của provider
+_MAX_CONCURRENT_SEARCHES = 8
+_SEARCH_SLOTS = threading.BoundedSemaphore(_MAX_CONCURRENT_SEARCHES)
+
+
+# Cache kết quả search/fetch (LRU + TTL): agent hay lặp lại cùng một truy vấn
+_RESULT_CACHE_TTL_SECONDS = 3600
+_RESULT_CACHE_MAX_ENTRIES = 1024
+_RESULT_CACHE: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _cached_result(key: tuple, compute: Callable[[], str]) -> str:
+    """
+    Trả kết quả đã cache cho key nếu còn hạn, nếu không thì gọi compute().
+
+    Kết quả lỗi (bắt đầu bằng "Lỗi" / "# Lỗi") không được cache.
+    """
+    now = time.monotonic()
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is not None and entry[0] > now:
+            _RESULT_CACHE.move_to_end(key)
+            return entry[1]
+
+    result = compute()
+
+    if not result.startswith(("Lỗi", "# Lỗi")):
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = (now + _RESULT_CACHE_TTL_SECONDS, result)
+            _RESULT_CACHE.move_to_end(key)
+            while len(_RESULT_CACHE) > _RESULT_CACHE_MAX_ENTRIES:
+                _RESULT_CACHE.popitem(last=False)
+
+    return result
+
+
+def clear_web_cache() -> None:
+    """Xóa cache kết quả web search / fetch (ví dụ khi cần dữ liệu mới)."""
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.clear()
+
+
+def _limited_search(provider, query: str, *args) -> str:
+    """Gọi provider.search (có cache) trong giới hạn số request đồng thời."""
+    def run_search() -> str:
+        with _SEARCH_SLOTS:
+            return provider.search(query, *args)
+
+    return _cached_result(("search", provider, query, *args), run_search)
+
+
 @tool("Web Search - Tìm kiếm Web")
 def web_search(
     query: str,
@@ -49,7 +109,7 @@ def web_search(
     try:
         from src.tools.search_providers import get_search_provider
         provider = get_search_provider()
-        return provider.search(query, num_results, language, region, time_range)
+        return _limited_search(provider, query, num_results, language, region, time_range)
     except ImportError:
         # Fallback to mock results if no provider configured
         return _mock_web_search(query, num_results)
@@ -78,20 +138,48 @@ def search_with_sources(
         ...     ["kubernetes.io", "github.com"]
         ... )
     """
+    jobs = [(f"site:{source} {query}", num_results) for source in sources]
+    found = _run_searches(jobs)
+    return _format_source_results(query, sources, [found[job] for job in jobs])
+
+
+def _run_searches(jobs: List[Tuple[str, int]]) -> Dict[Tuple[str, int], Optional[str]]:
+    """
+    Chạy song song các search (query, num_results) qua provider dùng chung.
+
+    Returns:
+        Dict job -> kết quả, hoặc None nếu không có provider (ImportError)
+    """
+    unique_jobs = list(dict.fromkeys(jobs))
+    if not unique_jobs:
+        return {}
+
+    try:
+        from src.tools.search_providers import get_search_provider
+        provider = get_search_provider()
+    except ImportError:
+        return dict.fromkeys(unique_jobs)
+
+    def run_job(job: Tuple[str, int]) -> Optional[str]:
+        query, num_results = job
+        try:
+            return _limited_search(provider, query, num_results, "vi", "VN", None)
+        except ImportError:
+            return None
+
+    # Các search chạy song song (I/O-bound), executor.map giữ thứ tự job
+    with ThreadPoolExecutor(max_workers=min(len(unique_jobs), _MAX_SOURCE_WORKERS)) as executor:
+        return dict(zip(unique_jobs, executor.map(run_job, unique_jobs)))
+
+
+def _format_source_results(query: str, sources: List[str], source_results: List[Optional[str]]) -> str:
+    """Format kết quả search_with_sources theo thứ tự nguồn."""
     results = [f"# Tìm kiếm: '{query}'\n"]
     results.append(f"Nguồn: {', '.join(sources)}\n\n")
 
-    for source in sources:
+    for source, source_result in zip(sources, source_results):
         results.append(f"## Từ {source}\n")
-        # Add site: filter to query
-        site_query = f"site:{source} {query}"
-        try:
-            from src.tools.search_providers import get_search_provider
-            provider = get_search_provider()
-            source_results = provider.search(site_query, num_results, "vi", "VN", None)
-            results.append(source_results)
-        except ImportError:
-            results.append("(Không thể kết nối)\n")
+        results.append(source_result if source_result is not None else "(Không thể kết nối)\n")
         results.append("\n")
 
     return "".join(results)
@@ -115,11 +203,31 @@ def fetch_web_page(url: str, max_length: int = 5000) -> str:
     """
     try:
         from src.tools.web_fetcher import fetch_and_parse_url
-        return fetch_and_parse_url(url, max_length)
+        return _cached_result(("fetch", url, max_length), lambda: fetch_and_parse_url(url, max_length))
     except ImportError:
         return _mock_fetch_web_page(url, max_length)
 
 
+# Nguồn tài liệu mặc định theo công nghệ cho search_documentation
+_DOC_SOURCES = {
+    "react": ["react.dev", "legacy.reactjs.org"],
+    "vue": ["vuejs.org", "v2.vuejs.org"],
+    "angular": ["angular.io"],
+    "kubernetes": ["kubernetes.io", "kubernetes.io/docs"],
+    "docker": ["docs.docker.com"],
+    "postgresql": ["postgresql.org/docs"],
+    "mysql": ["dev.mysql.com/doc"],
+    "mongodb": ["mongodb.com/docs"],
+    "redis": ["redis.io/docs"],
+    "python": ["docs.python.org"],
+    "javascript": ["developer.mozilla.org", "nodejs.org"],
+    "typescript": ["typescriptlang.org/docs", "www.typescriptlang.org/docs/handbook"],
+    "java": ["docs.oracle.com"],
+    "go": ["go.dev/doc", "golang.org/doc"],
+    "rust": ["doc.rust-lang.org"],
+}
+
+
 @tool("Search Documentation - Tìm Kiếm Tài Liệu")
 def search_documentation(
     technology: str,
@@ -141,35 +249,71 @@ def search_documentation(
         >>> docs = search_documentation("kubernetes", "helm charts")
         >>> print(docs)
     """
-    # Default documentation sources
-    default_sources = {
-        "react": ["react.dev", "legacy.reactjs.org"],
-        "vue": ["vuejs.org", "v2.vuejs.org"],
-        "angular": ["angular.io"],
-        "kubernetes": ["kubernetes.io", "kubernetes.io/docs"],
-        "docker": ["docs.docker.com"],
-        "postgresql": ["postgresql.org/docs"],
-        "mysql": ["dev.mysql.com/doc"],
-        "mongodb": ["mongodb.com/docs"],
-        "redis": ["redis.io/docs"],
-        "python": ["docs.python.org"],
-        "javascript": ["developer.mozilla.org", "nodejs.org"],
-        "typescript": ["typescriptlang.org/docs", "www.typescriptlang.org/docs/handbook"],
-        "java": ["docs.oracle.com"],
-        "go": ["go.dev/doc", "golang.org/doc"],
-        "rust": ["doc.rust-lang.org"],
-    }
-
-    sources = doc_sources or default_sources.get(technology.lower(), [])
-
-    if not sources:
-        # Generic search
-        query = f"{technology} {topic} documentation tutorial"
-        return web_search.run(query, num_results=5)
-
-    # Search specific documentation sites
-    query = f"{topic}"
-    return search_with_sources.run(query, sources, num_results=3)
+    key = (technology, topic)
+    return search_documentation_batch([key], doc_sources)[key]
+
+
+def search_documentation_batch(
+    queries: List[Tuple[str, str]],
+    doc_sources: Optional[List[str]] = None,
+) -> Dict[Tuple[str, str], str]:
+    """
+    Tìm tài liệu cho nhiều cặp (technology, topic) cùng lúc.
+
+    Tất cả các search con (mọi nguồn của mọi cặp) được gộp, bỏ trùng và chạy
+    song song trong một lượt, thay vì tuần tự từng công nghệ.
+
+    Args:
+        queries: Danh sách (technology, topic)
+        doc_sources: Nguồn tài liệu dùng cho mọi cặp (tự động phát hiện nếu None)
+
+    Returns:
+        Dict[Tuple[str, str], str]: Kết quả cho từng (technology, topic),
+        cùng định dạng với search_documentation
+
+    Examples:
+        >>> docs = search_documentation_batch([("react", "hooks"), ("redis", "streams")])
+        >>> print(docs[("redis", "streams")])
+    """
+    plans = {}
+    jobs: List[Tuple[str, int]] = []
+    for technology, topic in dict.fromkeys(queries):
+        sources = doc_sources or _DOC_SOURCES.get(technology.lower(), [])
+        if sources:
+            # Search specific documentation sites
+            source_jobs = [(f"site:{source} {topic}", 3) for source in sources]
+        else:
+            # Generic search
+            source_jobs = [(f"{technology} {topic} documentation tutorial", 5)]
+        plans[(technology, topic)] = (sources, source_jobs)
+        jobs.extend(source_jobs)
+
+    found = _run_searches(jobs)
+
+    results = {}
+    for (technology, topic), (sources, source_jobs) in plans.items():
+        if sources:
+            results[(technology, topic)] = _format_source_results(
+                topic, sources, [found[job] for job in source_jobs]
+            )
+        else:
+            query, num_results = source_jobs[0]
+            result = found[source_jobs[0]]
+            results[(technology, topic)] = result if result is not None else _mock_web_search(query, num_results)
+    return results
+
+
+# Bộ lọc GitHub search theo issue_type / state cho search_github_issues
+_GITHUB_TYPE_FILTERS = {
+    "prs": "is:pr ",
+    "issues": "is:issue ",
+    "both": "is:pr OR is:issue ",
+}
+_GITHUB_STATE_FILTERS = {
+    "open": "is:open ",
+    "closed": "is:closed ",
+    "all": "",
+}
 
 
 @tool("Search GitHub Issues - Tìm Kiếm GitHub Issues")
@@ -195,24 +339,9 @@ def search_github_issues(
         >>> issues = search_github_issues("facebook/react", "issues", "open", "performance")
         >>> print(issues)
     """
-    query = f"repo:{repository} "
-
-    if issue_type == "prs":
-        query += "is:pr "
-    elif issue_type == "issues":
-        query += "is:issue "
-    else:
-        query += "is:pr OR is:issue "
-
-    if state == "open":
-        query += "is:open "
-    elif state == "closed":
-        query += "is:closed "
-    else:
-        query += " "
-
-    if keywords:
-        query += keywords
+    type_filter = _GITHUB_TYPE_FILTERS.get(issue_type, _GITHUB_TYPE_FILTERS["both"])
+    state_filter = _GITHUB_STATE_FILTERS.get(state, "")
+    query = f"repo:{repository} {type_filter}{state_filter}{keywords or ''}"
 
     # Search on GitHub
     return search_with_sources.run(
@@ -293,17 +422,22 @@ def search_security_vulnerabilities(
 
 def _mock_web_search(query: str, num_results: int = 5) -> str:
     """Mock web search khi không có provider."""
-    results = f"# Kết quả tìm kiếm cho: '{query}'\n\n"
-    results += f"Lưu ý: Đây là kết quả giả lập. Cần cấu hình provider thực tế.\n\n"
+    results = [
+        f"# Kết quả tìm kiếm cho: '{query}'\n\n",
+        "Lưu ý: Đây là kết quả giả lập. Cần cấu hình provider thực tế.\n\n",
+    ]
 
+    link = f"https://example.com/search?q={query.replace(' ', '+')}"
     for i in range(min(num_results, 3)):
-        results += f"## Kết quả {i+1}\n"
-        results += f"- **Tiêu đề**: Kết quả mẫu cho '{query}'\n"
-        results += f"- **Link**: https://example.com/search?q={query.replace(' ', '+')}\n"
-        results += f"- **Mô tả**: Đây là kết quả giả lập. Cần cấu hình web search provider.\n"
-        results += "\n"
+        results.append(
+            f"## Kết quả {i+1}\n"
+            f"- **Tiêu đề**: Kết quả mẫu cho '{query}'\n"
+            f"- **Link**: {link}\n"
+            "- **Mô tả**: Đây là kết quả giả lập. Cần cấu hình web search provider.\n"
+            "\n"
+        )
 
-    return results
+    return "".join(results)
 
 
 def _mock_fetch_web_page(url: str, max_length: int = 5000) -> str:
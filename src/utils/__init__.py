@@ -1,14 +1,17 @@
 """Utils package for Deep-Spec AI."""
 
-from src.utils.llm_provider import (
-    get_llm,
-    get_zai_llm,
-    get_google_llm,
-    get_agent_llm,
-    LLMProvider,
-    ModelConfig,
-    AGENT_PROVIDER_RECOMMENDATIONS,
-)
+import importlib
+
+# Tên export -> module chứa nó; submodule chỉ được import khi cần (PEP 562)
+_LAZY_EXPORTS = {
+    "get_llm": "src.utils.llm_provider",
+    "get_zai_llm": "src.utils.llm_provider",
+    "get_google_llm": "src.utils.llm_provider",
+    "get_agent_llm": "src.utils.llm_provider",
+    "LLMProvider": "src.utils.llm_provider",
+    "ModelConfig": "src.utils.llm_provider",
+    "AGENT_PROVIDER_RECOMMENDATIONS": "src.utils.llm_provider",
+}
 
 __all__ = [
     "get_llm",
@@ -19,3 +22,16 @@ __all__ = [
     "ModelConfig",
     "AGENT_PROVIDER_RECOMMENDATIONS",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # cache để lần sau không qua __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -14,14 +14,39 @@ Usage:
     llm = get_llm("zai")
 """
 
+from __future__ import annotations
+
 import os
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Literal
-from crewai import LLM
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Literal
+
+# crewai (kéo theo LiteLLM) chỉ import khi thực sự tạo LLM, để import
+# LLMProvider / ModelConfig / PROVIDER_CONFIG không tốn vài giây
+if TYPE_CHECKING:
+    from crewai import LLM
+
+# .env đã được load trong process này chưa (module-level, không ghi vào
+# os.environ để subprocess vẫn load .env của chính nó)
+_env_loaded = False
+
+
+def load_env() -> None:
+    """
+    Load biến môi trường từ .env, tối đa một lần cho mỗi process.
+
+    Các module gọi hàm này thay vì load_dotenv() trực tiếp, nên .env chỉ bị
+    tìm và parse một lần.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+
+    from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+    load_dotenv()
+    _env_loaded = True
 
 
 class LLMProvider(str, Enum):
@@ -47,22 +72,34 @@ class ModelConfig(str, Enum):
     GEMINI_THINKING = "gemini/gemini-3-pro-preview"  # Complex reasoning
 
 
+@dataclass(frozen=True, slots=True)
+class ProviderConfig:
+    """
+    Static configuration for one LLM provider.
+    """
+    env_key: str
+    base_url_env: Optional[str]
+    default_model: ModelConfig
+    default_temperature: float
+    default_timeout: int
+
+
 # Provider-specific configuration
 PROVIDER_CONFIG = {
-    LLMProvider.ZAI: {
-        "env_key": "OPENAI_API_KEY",
-        "base_url_env": "OPENAI_API_BASE",
-        "default_model": ModelConfig.ZAI_STANDARD,
-        "default_temperature": 0.3,
-        "default_timeout": 120,
-    },
-    LLMProvider.GOOGLE: {
-        "env_key": "GOOGLE_API_KEY",
-        "base_url_env": None,
-        "default_model": ModelConfig.GEMINI_PRO,
-        "default_temperature": 0.5,
-        "default_timeout": 120,
-    },
+    LLMProvider.ZAI: ProviderConfig(
+        env_key="OPENAI_API_KEY",
+        base_url_env="OPENAI_API_BASE",
+        default_model=ModelConfig.ZAI_STANDARD,
+        default_temperature=0.3,
+        default_timeout=120,
+    ),
+    LLMProvider.GOOGLE: ProviderConfig(
+        env_key="GOOGLE_API_KEY",
+        base_url_env=None,
+        default_model=ModelConfig.GEMINI_PRO,
+        default_temperature=0.5,
+        default_timeout=120,
+    ),
 }
 
 
@@ -76,6 +113,9 @@ def get_llm(
     """
     Factory function to get an LLM instance based on the provider.
 
+    Instances are cached per (provider, model, temperature, timeout, API key,
+    base URL), so repeated calls with the same configuration share one LLM.
+
     Args:
         provider: The LLM provider (LLMProvider enum or string: "zai", "google")
         model: Specific model name to use. If None, uses provider's default.
@@ -96,6 +136,9 @@ def get_llm(
         >>> # Get specific Gemini model with custom temperature
         >>> llm = get_llm("google", model="gemini/gemini-2.0-flash-exp", temperature=0.7)
     """
+    # Load environment variables (chỉ lần gọi đầu tiên thực sự đọc .env)
+    load_env()
+
     # Normalize provider to enum
     if isinstance(provider, str):
         provider = provider.lower()
@@ -113,18 +156,40 @@ def get_llm(
         raise ValueError(f"No configuration found for provider: {provider}")
 
     # Get API key
-    api_key = os.getenv(config["env_key"])
+    api_key = os.getenv(config.env_key)
     if not api_key:
         raise ValueError(
             f"API key not found for provider '{provider.value}'. "
-            f"Please set environment variable: {config['env_key']}"
+            f"Please set environment variable: {config.env_key}"
         )
 
     # Set defaults
-    model = model or config["default_model"].value
-    temperature = temperature if temperature is not None else config["default_temperature"]
-    timeout = timeout if timeout is not None else config["default_timeout"]
+    model = model or config.default_model.value
+    temperature = temperature if temperature is not None else config.default_temperature
+    timeout = timeout if timeout is not None else config.default_timeout
+
+    # Base URL cho Z.AI (OpenAI-compatible)
+    base_url = os.getenv(config.base_url_env) if provider == LLMProvider.ZAI else None
 
+    return _build_llm(provider, model, temperature, timeout, api_key, base_url)
+
+
+@lru_cache(maxsize=32)
+def _build_llm(
+    provider: LLMProvider,
+    model: str,
+    temperature: float,
+    timeout: int,
+    api_key: str,
+    base_url: Optional[str],
+) -> LLM:
+    """
+    Tạo LLM instance, cache theo toàn bộ cấu hình.
+
+    Các agent dùng cùng cấu hình sẽ dùng chung một instance (và HTTP client
+    bên dưới). API key / base URL nằm trong key cache nên đổi env vẫn tạo
+    instance mới.
+    """
     # Build LLM kwargs
     llm_kwargs = {
         "model": model,
@@ -135,13 +200,15 @@ def get_llm(
 
     # Add base_url for Z.AI (OpenAI-compatible)
     if provider == LLMProvider.ZAI:
-        base_url = os.getenv(config["base_url_env"])
+        config = PROVIDER_CONFIG[provider]
         if not base_url:
-            print(f"Warning: {config['base_url_env']} not found. Using default OpenAI endpoint.")
+            print(f"Warning: {config.base_url_env} not found. Using default OpenAI endpoint.")
         else:
             llm_kwargs["base_url"] = base_url
 
     # Create and return LLM instance
+    from crewai import LLM
+
     try:
         return LLM(**llm_kwargs)
     except Exception as e:
@@ -274,6 +341,7 @@ def get_google_gemini_embedder_config():
     Note:
         Cần GOOGLE_API_KEY trong environment (.env file)
     """
+    load_env()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError(
@@ -281,6 +349,12 @@ def get_google_gemini_embedder_config():
             "Please set it in your .env file."
         )
 
+    return _gemini_embedder_config(api_key)
+
+
+@lru_cache(maxsize=4)
+def _gemini_embedder_config(api_key: str) -> dict:
+    """Build embedder config một lần cho mỗi API key (dict dùng chung, không mutate)."""
     return {
         "provider": "google-generativeai",
         "config": {
@@ -10,9 +10,55 @@ Implements validation rules for:
 - No overlap between business and technical edge cases
 """
 
-from typing import Dict, List, Any, Tuple
+import re
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from src.schemas import HappyPath, StressTestReport
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick là optional, fallback sang vòng lặp substring
+    ahocorasick = None
+
+
+def _build_keyword_automaton(keywords: List[str]) -> Optional[Any]:
+    """
+    Build Aho-Corasick automaton cho danh sách keywords (lowercase).
+
+    Mỗi word map tới (vị trí trong danh sách, keyword) để giữ thứ tự báo cáo.
+    Trả về None nếu chưa cài pyahocorasick.
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(keywords):
+        automaton.add_word(keyword.lower(), (index, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_keyword_pattern(
+    keywords: List[str],
+) -> Tuple["re.Pattern[str]", Dict[str, Tuple[Tuple[int, str], ...]]]:
+    """
+    Build regex alternation cho danh sách keywords (fallback khi không có pyahocorasick).
+
+    Regex dùng lookahead nên thử match ở mọi vị trí; tại mỗi vị trí chỉ keyword
+    dài nhất được trả về, nên kèm theo map keyword -> các keyword nằm trong nó
+    (ví dụ "https" -> "http") để kết quả giống hệt kiểm tra substring.
+    """
+    lowered = [(index, keyword, keyword.lower()) for index, keyword in enumerate(keywords)]
+    alternation = "|".join(
+        re.escape(low) for low in sorted({low for _, _, low in lowered}, key=len, reverse=True)
+    )
+    contained = {
+        outer: tuple((index, keyword) for index, keyword, low in lowered if low in outer)
+        for _, _, outer in lowered
+    }
+    return re.compile(f"(?=({alternation}))"), contained
+
 
 class HierarchicalValidator:
     """
@@ -70,6 +116,12 @@ class HierarchicalValidator:
         "non-blocking",
     ]
 
+    # Automaton quét tất cả keywords trong một lượt (None nếu thiếu pyahocorasick)
+    _KEYWORD_AUTOMATON = _build_keyword_automaton(TECHNICAL_KEYWORDS)
+
+    # Fallback: một regex alternation duy nhất, chạy trong regex engine (C)
+    _KEYWORD_PATTERN, _KEYWORDS_CONTAINED = _build_keyword_pattern(TECHNICAL_KEYWORDS)
+
     # Minimum thresholds
     MIN_HAPPY_PATH_STEPS = 3
     MIN_EDGE_CASES_PER_REPORT = 5
@@ -216,19 +268,49 @@ class HierarchicalValidator:
         Returns:
             List[str]: List of technical keywords found
         """
-        keywords_found: List[str] = []
-
-        for edge_case in edge_cases:
-            # Check description and trigger condition for technical keywords
-            text_to_check = (
-                edge_case.description.lower() + " " + edge_case.trigger_condition.lower()
-            )
+        # Ghép text của mọi edge case (đã lowercase) thành một buffer và quét
+        # một lần; keyword không chứa "\n" nên match không vượt qua ranh giới
+        texts = [
+            edge_case.description.lower() + " " + edge_case.trigger_condition.lower()
+            for edge_case in edge_cases
+        ]
+        corpus = "\n".join(texts)
+
+        # Offset bắt đầu của từng edge case trong corpus
+        case_starts: List[int] = []
+        offset = 0
+        for text in texts:
+            case_starts.append(offset)
+            offset += len(text) + 1
+
+        # (vị trí trong TECHNICAL_KEYWORDS, keyword) -> edge case đầu tiên chứa nó
+        first_case: Dict[Tuple[int, str], int] = {}
+        for position, value in self._scan_keywords(corpus):
+            case_index = bisect_right(case_starts, position) - 1
+            if case_index < first_case.get(value, len(texts)):
+                first_case[value] = case_index
+
+        # Thứ tự báo cáo như trước: theo edge case, rồi theo TECHNICAL_KEYWORDS
+        return [
+            keyword
+            for _, keyword in sorted(first_case, key=lambda value: (first_case[value], value[0]))
+        ]
+
+    def _scan_keywords(self, text: str) -> Iterator[Tuple[int, Tuple[int, str]]]:
+        """
+        Tìm tất cả technical keywords là substring của text (đã lowercase).
 
-            for keyword in self.TECHNICAL_KEYWORDS:
-                if keyword.lower() in text_to_check and keyword not in keywords_found:
-                    keywords_found.append(keyword)
+        Yields:
+            Tuple[int, Tuple[int, str]]: (vị trí match trong text,
+            (vị trí trong TECHNICAL_KEYWORDS, keyword))
+        """
+        if self._KEYWORD_AUTOMATON is not None:
+            yield from self._KEYWORD_AUTOMATON.iter(text)
+            return
 
-        return keywords_found
+        for match in self._KEYWORD_PATTERN.finditer(text):
+            for value in self._KEYWORDS_CONTAINED[match.group(1)]:
+                yield match.start(), value
 
     def _validate_no_overlap(
         self, business_cases: List, technical_cases: List
@@ -248,29 +330,43 @@ class HierarchicalValidator:
         """
         warnings: List[str] = []
 
+        # Không có gì để so sánh: bỏ qua việc tokenize
+        if not business_cases or not technical_cases:
+            return warnings
+
         # Extract descriptions from business cases
         business_descriptions = [case.description.lower() for case in business_cases]
 
+        # Inverted index word -> các business case chứa word đó, build một lần
+        # thay vì tạo lại set từ của mọi business case cho từng technical case
+        word_index: Dict[str, List[int]] = defaultdict(list)
+        for biz_index, biz_desc in enumerate(business_descriptions):
+            for word in set(biz_desc.split()):
+                word_index[word].append(biz_index)
+
         # Check each technical case against business cases
         for tech_case in technical_cases:
             tech_desc = tech_case.description.lower()
 
-            # Simple overlap detection: check if any significant words match
+            # Ít hơn 4 từ thì không thể có hơn 3 từ chung
             tech_words = set(tech_desc.split())
-            for biz_desc in business_descriptions:
-                biz_words = set(biz_desc.split())
-
-                # Calculate overlap (intersection of words)
-                overlap = tech_words & biz_words
-
-                # If more than 3 words overlap, flag it
-                if len(overlap) > 3:
-                    warnings.append(
-                        f"Possible overlap detected: Technical case '{tech_case.description}' "
-                        f"shares significant words with business case '{biz_desc}'. "
-                        f"Consider consolidating or clarifying the distinction."
-                    )
-                    break  # Only warn once per technical case
+            if len(tech_words) <= 3:
+                continue
+
+            # Simple overlap detection: đếm số từ chung với từng business case
+            shared_counts: Counter = Counter()
+            for word in tech_words:
+                shared_counts.update(word_index.get(word, ()))
+
+            # If more than 3 words overlap, flag it (business case đầu tiên theo thứ tự)
+            overlapping = [biz_index for biz_index, count in shared_counts.items() if count > 3]
+            if overlapping:
+                biz_desc = business_descriptions[min(overlapping)]
+                warnings.append(
+                    f"Possible overlap detected: Technical case '{tech_case.description}' "
+                    f"shares significant words with business case '{biz_desc}'. "
+                    f"Consider consolidating or clarifying the distinction."
+                )
 
         return warnings
 
@@ -1,14 +1,15 @@
 """Hierarchical workflow package."""
 
-from src.workflows.hierarchical_orchestrator import (
-    HierarchicalOrchestrator,
-    HierarchicalOrchestratorConfig,
-)
-from src.workflows.hierarchical_workflow import (
-    HierarchicalWorkflow,
-    HierarchicalWorkflowConfig,
-    execute_hierarchical_workflow,
-)
+import importlib
+
+# Tên export -> module chứa nó; submodule chỉ được import khi cần (PEP 562)
+_LAZY_EXPORTS = {
+    "HierarchicalOrchestrator": "src.workflows.hierarchical_orchestrator",
+    "HierarchicalOrchestratorConfig": "src.workflows.hierarchical_orchestrator",
+    "HierarchicalWorkflow": "src.workflows.hierarchical_workflow",
+    "HierarchicalWorkflowConfig": "src.workflows.hierarchical_workflow",
+    "execute_hierarchical_workflow": "src.workflows.hierarchical_workflow",
+}
 
 __all__ = [
     "HierarchicalOrchestrator",
@@ -17,3 +18,16 @@ __all__ = [
     "HierarchicalWorkflow",
     "execute_hierarchical_workflow",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # cache để lần sau không qua __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,19 +5,48 @@ Sử dụng CrewAI's hierarchical process với Manager Agent điều phối wor
 Manager có thể là LLM hoặc human để điều phối task động.
 """
 
-from typing import List, Optional, Dict, Any, Literal
-from dataclasses import dataclass, field
+from typing import Coroutine, List, Optional, Dict, Any, Literal, Sequence
+from dataclasses import dataclass
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Agent, Task, Crew, LLM
-from dotenv import load_dotenv
 import os
 
-from src.utils.llm_provider import get_llm, get_google_gemini_embedder_config
+from src.utils.llm_provider import get_llm, get_google_gemini_embedder_config, load_env
 from src.schemas import HappyPath, StressTestReport
 
-load_dotenv()
+load_env()
 
+# Instructions tĩnh cho Manager Agent, build một lần thay vì mỗi lần tạo agent
+_MANAGER_INSTRUCTIONS = (
+    "LUÔN TRẢ LỜI BẰNG TIẾNG VIỆT.",
+    "Điều phối worker agents để hoàn thành technical design",
+    "Đánh giá kết quả từ từng worker trước khi quyết định bước tiếp theo",
+    "Tổng hợp output từ tất cả workers thành final document",
+    "Đảm bảo tất cả aspects được cover: happy path, edge cases, security",
+    "Ra quyết định dựa trên context và chất lượng output của workers",
+    "Phân công task phù hợp cho từng worker dựa trên khả năng của họ",
+)
 
-@dataclass
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Chạy coroutine tới khi xong từ code sync.
+
+    asyncio.run() raise RuntimeError khi thread hiện tại đã có event loop chạy
+    (async server, notebook); khi đó chạy coroutine trong worker thread với
+    event loop riêng.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+@dataclass(frozen=True, slots=True)
 class HierarchicalOrchestratorConfig:
     """Cấu hình cho Hierarchical Orchestrator."""
 
@@ -68,33 +97,34 @@ class HierarchicalOrchestrator:
 
     def __init__(self, config: HierarchicalOrchestratorConfig):
         self.config = config
+        self.manager_llm: Optional[LLM] = None
         self.manager_agent: Optional[Agent] = None
         self.crew: Optional[Crew] = None
         self._create_manager_agent()
 
     def _create_manager_agent(self) -> Agent:
         """Tạo Manager Agent để điều phối workflow."""
-        manager_llm = get_llm(self.config.manager_llm_provider)
+        # Tạo một lần, dùng chung cho Manager Agent và Crew (manager_llm)
+        self.manager_llm = get_llm(self.config.manager_llm_provider)
 
         self.manager_agent = Agent(
             role="Manager Agent - CTO",
             goal=self.config.manager_goal,
             backstory=self.config.manager_backstory,
-            llm=manager_llm,
+            llm=self.manager_llm,
             verbose=self.config.verbose,
             memory=self.config.memory,
             allow_delegation=self.config.allow_delegation_to_manager,
             # Manager không làm task cụ thể, chỉ điều phối
-            instructions=[
-                "LUÔN TRẢ LỜI BẰNG TIẾNG VIỆT.",
-                "Điều phối worker agents để hoàn thành technical design",
-                "Đánh giá kết quả từ từng worker trước khi quyết định bước tiếp theo",
-                "Tổng hợp output từ tất cả workers thành final document",
-                "Đảm bảo tất cả aspects được cover: happy path, edge cases, security",
-                "Ra quyết định dựa trên context và chất lượng output của workers",
-                "Phân công task phù hợp cho từng worker dựa trên khả năng của họ",
-            ],
+            instructions=_MANAGER_INSTRUCTIONS,
         )
+
+        # Agent có expose output hay không là cố định theo version crewai:
+        # kiểm tra một lần thay vì getattr mỗi lần execute
+        if hasattr(self.manager_agent, "output"):
+            self._get_manager_output = lambda agent=self.manager_agent: agent.output
+        else:
+            self._get_manager_output = lambda: None
         return self.manager_agent
 
     def create_hierarchical_crew(
@@ -112,26 +142,39 @@ class HierarchicalOrchestrator:
         Returns:
             Crew: Hierarchical crew object
         """
+        self.crew = self._build_crew(workers, tasks)
+        return self.crew
+
+    def _build_crew(
+        self,
+        workers: List[Agent],
+        tasks: Optional[List[Task]] = None,
+        manager_agent: Optional[Agent] = None,
+    ) -> Crew:
+        """
+        Tạo một Crew hierarchical (manager + workers) mà không gán vào self.crew.
+
+        manager_agent mặc định là self.manager_agent; truyền bản copy khi nhiều
+        crews chạy đồng thời.
+        """
         if tasks is None:
             tasks = []
 
-        all_agents = [self.manager_agent] + workers
+        all_agents = [manager_agent or self.manager_agent] + workers
 
         # Configure Google Gemini embeddings for memory/RAG
         embedder_config = get_google_gemini_embedder_config()
 
-        self.crew = Crew(
+        return Crew(
             agents=all_agents,
             tasks=tasks,
             process="hierarchical",
-            manager_llm=get_llm(self.config.manager_llm_provider),
+            manager_llm=self.manager_llm,
             verbose=self.config.verbose,
             memory=self.config.memory,
             embedder=embedder_config,
         )
 
-        return self.crew
-
     def execute_workflow(
         self,
         user_requirement: str,
@@ -167,11 +210,114 @@ class HierarchicalOrchestrator:
         result = self.crew.kickoff()
 
         return {
-            "manager_output": getattr(self.manager_agent, "output", None),
+            "manager_output": self._get_manager_output(),
             "raw_output": result,
             "final_result": self._parse_hierarchical_result(result),
         }
 
+    def execute_workflows_concurrently(
+        self,
+        user_requirement: str,
+        shared_tasks: List[Task],
+        shared_workers: List[Agent],
+        task_sets: Sequence[List[Task]],
+        worker_sets: Sequence[List[Agent]],
+    ) -> Dict[str, Any]:
+        """
+        Execute shared tasks một lần rồi fan-out các sub-crew song song.
+
+        shared_tasks (ví dụ happy path + business exceptions) chạy một lần
+        trong một crew. Sau đó mỗi task_sets[i] (ví dụ technical edge cases
+        của auditor i, có context trỏ tới shared_tasks đã chạy) chạy trong
+        sub-crew riêng, kickoff đồng thời vì thời gian chủ yếu là chờ LLM.
+        Mỗi sub-crew có workers riêng và bản copy của manager agent nên các
+        lần chạy không ghi đè state Agent của nhau.
+
+        Args:
+            user_requirement: Yêu cầu từ user (feature description)
+            shared_tasks: Tasks chạy một lần, trước các sub-crew
+            shared_workers: Worker agents cho shared_tasks
+            task_sets: Danh sách tasks cho từng sub-crew
+            worker_sets: Worker agents cho từng sub-crew (cùng thứ tự với
+                task_sets, không dùng chung agent giữa các sub-crew)
+
+        Returns:
+            dict: Cùng keys với execute_workflow() cộng shared_output (kết quả
+                của shared_tasks); raw_output và final_result là list theo thứ
+                tự sub-crew
+        """
+        if len(task_sets) != len(worker_sets):
+            raise ValueError("task_sets và worker_sets phải có cùng số phần tử.")
+
+        shared_output = self._build_crew(shared_workers, shared_tasks).kickoff()
+
+        crews = [
+            self._build_crew(workers, tasks, manager_agent=self.manager_agent.copy())
+            for workers, tasks in zip(worker_sets, task_sets)
+        ]
+
+        async def _kickoff_all() -> List[Any]:
+            return await asyncio.gather(*(crew.kickoff_async() for crew in crews))
+
+        results = _run_coroutine(_kickoff_all())
+
+        return {
+            "manager_output": self._get_manager_output(),
+            "shared_output": shared_output,
+            "raw_output": results,
+            "final_result": [self._parse_hierarchical_result(r) for r in results],
+        }
+
+    def execute_workflow_for_each(
+        self,
+        inputs: List[Dict[str, Any]],
+        tasks: List[Task],
+        workers: List[Agent],
+        max_concurrency: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute cùng một crew cho nhiều inputs (batch), song song có giới hạn.
+
+        Crew được build một lần; tasks dùng placeholder (ví dụ {requirement})
+        được crewai interpolate theo từng input. Giống
+        Crew.kickoff_for_each_async, mỗi input chạy trên một crew.copy() nên
+        các lần chạy không chia sẻ state; tối đa max_concurrency lần chạy
+        đồng thời (giới hạn theo rate limit của provider).
+
+        Args:
+            inputs: Một dict interpolation cho mỗi lần chạy
+            tasks: Tasks có placeholder tương ứng với keys trong inputs
+            workers: Worker agents
+            max_concurrency: Số crew chạy đồng thời tối đa
+
+        Returns:
+            list[dict]: Mỗi phần tử cùng keys với execute_workflow(), theo thứ tự inputs
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency phải >= 1")
+
+        crew = self._build_crew(workers, tasks)
+
+        async def _kickoff_all() -> List[Any]:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def _kickoff(input_data: Dict[str, Any]) -> Any:
+                async with semaphore:
+                    return await crew.copy().kickoff_async(inputs=input_data)
+
+            return await asyncio.gather(*(_kickoff(item) for item in inputs))
+
+        results = _run_coroutine(_kickoff_all())
+
+        return [
+            {
+                "manager_output": self._get_manager_output(),
+                "raw_output": result,
+                "final_result": self._parse_hierarchical_result(result),
+            }
+            for result in results
+        ]
+
     def _parse_hierarchical_result(self, raw_result: str) -> Dict[str, Any]:
         """
         Parse kết quả từ hierarchical execution.
@@ -77,3 +77,144 @@ def test_execute_workflow():
     assert "final_result" in result
     # Verify raw_output contains some content (crew executed successfully)
     assert result["raw_output"] is not None
+
+
+def _fake_subcrew_builder(running, shared_runs):
+    """_build_crew giả: kickoff() đếm shared runs, kickoff_async() đo concurrency."""
+    import asyncio
+    from unittest.mock import MagicMock
+
+    def make_crew(workers, tasks, manager_agent=None):
+        async def kickoff_async():
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return f"result-{tasks[0]}"
+
+        def kickoff():
+            shared_runs.append(list(tasks))
+            return "shared"
+
+        crew = MagicMock()
+        crew.kickoff_async = kickoff_async
+        crew.kickoff = kickoff
+        return crew
+
+    return make_crew
+
+
+def test_execute_workflows_concurrently_runs_shared_tasks_once():
+    """Shared tasks chạy một lần, sub-crews được kickoff đồng thời và giữ thứ tự."""
+    from unittest.mock import patch
+
+    config = HierarchicalOrchestratorConfig(manager_llm_provider="google", verbose=False)
+    orchestrator = HierarchicalOrchestrator(config)
+
+    running = {"now": 0, "peak": 0}
+    shared_runs = []
+
+    with patch.object(
+        orchestrator, "_build_crew", side_effect=_fake_subcrew_builder(running, shared_runs)
+    ) as build:
+        result = orchestrator.execute_workflows_concurrently(
+            user_requirement="Hệ thống đăng nhập",
+            shared_tasks=["happy", "business"],
+            shared_workers=[],
+            task_sets=[["a"], ["b"], ["c"]],
+            worker_sets=[[], [], []],
+        )
+
+    assert shared_runs == [["happy", "business"]]
+    assert result["shared_output"] == "shared"
+    assert result["raw_output"] == ["result-a", "result-b", "result-c"]
+    assert len(result["final_result"]) == 3
+    assert running["peak"] == 3
+    assert orchestrator.crew is None
+    # Mỗi sub-crew có manager agent riêng
+    managers = [call.kwargs["manager_agent"] for call in build.call_args_list[1:]]
+    assert len({id(m) for m in managers}) == 3
+
+
+def test_execute_workflows_concurrently_inside_running_loop():
+    """Gọi từ code đang chạy trong event loop (async server, notebook) không lỗi."""
+    import asyncio
+    from unittest.mock import patch
+
+    config = HierarchicalOrchestratorConfig(manager_llm_provider="google", verbose=False)
+    orchestrator = HierarchicalOrchestrator(config)
+
+    async def call_from_loop():
+        with patch.object(
+            orchestrator, "_build_crew", side_effect=_fake_subcrew_builder({"now": 0, "peak": 0}, [])
+        ):
+            return orchestrator.execute_workflows_concurrently(
+                user_requirement="Hệ thống đăng nhập",
+                shared_tasks=[],
+                shared_workers=[],
+                task_sets=[["a"], ["b"]],
+                worker_sets=[[], []],
+            )
+
+    result = asyncio.run(call_from_loop())
+    assert result["raw_output"] == ["result-a", "result-b"]
+
+
+def test_execute_workflow_for_each_builds_one_crew():
+    """Batch inputs dùng chung một crew, giới hạn concurrency, giữ thứ tự inputs."""
+    import asyncio
+    from unittest.mock import MagicMock, patch
+
+    config = HierarchicalOrchestratorConfig(manager_llm_provider="google", verbose=False)
+    orchestrator = HierarchicalOrchestrator(config)
+
+    running = {"now": 0, "peak": 0}
+
+    async def kickoff_async(inputs):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return f"result-{inputs['requirement']}"
+
+    crew = MagicMock()
+    crew.copy.return_value.kickoff_async = kickoff_async
+
+    with patch.object(orchestrator, "_build_crew", return_value=crew) as build:
+        results = orchestrator.execute_workflow_for_each(
+            inputs=[{"requirement": r} for r in "abcde"],
+            tasks=[],
+            workers=[],
+            max_concurrency=2,
+        )
+
+    assert build.call_count == 1
+    assert [r["raw_output"] for r in results] == [f"result-{r}" for r in "abcde"]
+    assert all("final_result" in r for r in results)
+    assert running["peak"] == 2
+
+
+def test_execute_workflow_for_each_inside_running_loop():
+    """Batch API gọi được từ code đang chạy trong event loop."""
+    import asyncio
+    from unittest.mock import MagicMock, patch
+
+    config = HierarchicalOrchestratorConfig(manager_llm_provider="google", verbose=False)
+    orchestrator = HierarchicalOrchestrator(config)
+
+    async def kickoff_async(inputs):
+        return f"result-{inputs['requirement']}"
+
+    crew = MagicMock()
+    crew.copy.return_value.kickoff_async = kickoff_async
+
+    async def call_from_loop():
+        with patch.object(orchestrator, "_build_crew", return_value=crew):
+            return orchestrator.execute_workflow_for_each(
+                inputs=[{"requirement": r} for r in "ab"],
+                tasks=[],
+                workers=[],
+            )
+
+    results = asyncio.run(call_from_loop())
+    assert [r["raw_output"] for r in results] == ["result-a", "result-b"]
@@ -1,5 +1,7 @@
+import asyncio
+
 import pytest
-from src.tasks import create_hierarchical_tasks
+from src.tasks import create_hierarchical_tasks, create_hierarchical_tasks_async
 from src.agents import create_architect_agent, create_auditor_agent
 from src.schemas import HappyPath, StressTestReport
 
@@ -61,3 +63,23 @@ def test_technical_edge_cases_task_context():
     desc_lower = tasks[2].description.lower()
     assert "happy_path" in desc_lower or "happy path" in desc_lower
     assert "business_exception" in desc_lower or "business exception" in desc_lower
+
+def test_create_hierarchical_tasks_async_batch():
+    """Test tạo tasks cho nhiều requirements song song."""
+    architect = create_architect_agent()
+    auditor = create_auditor_agent()
+    requirements = ["User registration", "Payment processing"]
+
+    async def build_all():
+        return await asyncio.gather(*[
+            create_hierarchical_tasks_async(r, architect, auditor)
+            for r in requirements
+        ])
+
+    task_lists = asyncio.run(build_all())
+
+    assert len(task_lists) == 2
+    for requirement, tasks in zip(requirements, task_lists):
+        assert len(tasks) == 3
+        assert requirement in tasks[0].description
+        assert tasks[2].agent == auditor
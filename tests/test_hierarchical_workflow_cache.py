@@ -0,0 +1,258 @@
+"""Tests cho semantic cache của HierarchicalWorkflow."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.workflows import hierarchical_workflow as hw
+from src.workflows.hierarchical_workflow import (
+    HierarchicalWorkflow,
+    HierarchicalWorkflowConfig,
+    _SemanticCache,
+)
+
+
+def test_semantic_cache_hits_near_duplicate_and_misses_unrelated():
+    cache = _SemanticCache()
+    rng = np.random.default_rng(1)
+    emb = rng.standard_normal(64)
+
+    cache.set(emb, "cfg", {"feature": "auction"})
+
+    near = emb + 0.01 * rng.standard_normal(64)
+    assert cache.get(near, "cfg", 0.95) == {"feature": "auction"}
+    assert cache.get(rng.standard_normal(64), "cfg", 0.95) is None
+    # Cùng embedding nhưng khác config thì không dùng lại
+    assert cache.get(emb, "other-cfg", 0.95) is None
+
+
+def test_semantic_cache_evicts_least_recently_used():
+    cache = _SemanticCache(max_entries=2)
+    a, b, c = np.eye(3)
+
+    cache.set(a, "cfg", {"id": "a"})
+    cache.set(b, "cfg", {"id": "b"})
+    assert cache.get(a, "cfg", 0.95) == {"id": "a"}  # a mới được dùng
+    cache.set(c, "cfg", {"id": "c"})
+
+    assert len(cache) == 2
+    assert cache.get(b, "cfg", 0.95) is None
+    assert cache.get(a, "cfg", 0.95) == {"id": "a"}
+    assert cache.get(c, "cfg", 0.95) == {"id": "c"}
+
+
+def test_execute_skips_crew_on_semantic_cache_hit():
+    config = HierarchicalWorkflowConfig(
+        verbose=False,
+        memory=False,
+        enable_phase4_export=False,
+        enable_semantic_cache=True,
+    )
+    workflow = HierarchicalWorkflow(config)
+    fake_run = {"raw_output": "ok", "final_result": {}, "manager_output": None}
+    workflow._architect, workflow._auditors = object(), (object(),)
+
+    with patch.object(hw, "_SEMANTIC_CACHE", _SemanticCache()), \
+         patch.object(hw, "_embed_requirement", return_value=[1.0, 0.0, 0.0]), \
+         patch.object(HierarchicalWorkflow, "_create_agents"), \
+         patch("src.tasks.create_hierarchical_tasks", return_value=[]), \
+         patch.object(workflow.orchestrator, "execute_workflow", return_value=fake_run) as run:
+        first = workflow.execute("Hệ thống đấu giá thời gian thực")
+        second = workflow.execute("Hệ thống đấu giá realtime")
+
+    assert run.call_count == 1
+    assert second == first
+
+
+def test_semantic_cache_hit_reruns_phase4_and_copies_result():
+    config = HierarchicalWorkflowConfig(
+        verbose=False,
+        memory=False,
+        enable_semantic_cache=True,
+    )
+    workflow = HierarchicalWorkflow(config)
+    fake_run = {"raw_output": "ok", "final_result": {}, "manager_output": None}
+    workflow._architect, workflow._auditors = object(), (object(),)
+
+    with patch.object(hw, "_SEMANTIC_CACHE", _SemanticCache()), \
+         patch.object(hw, "_embed_requirement", return_value=[1.0, 0.0, 0.0]), \
+         patch.object(hw, "_validate_cached", return_value=(True, [])), \
+         patch.object(HierarchicalWorkflow, "_create_agents"), \
+         patch("src.tasks.create_hierarchical_tasks", return_value=[]), \
+         patch.object(workflow.orchestrator, "execute_workflow", return_value=fake_run) as run, \
+         patch.object(
+             HierarchicalWorkflow, "_run_phase4_export", side_effect=[{"run": 1}, {"run": 2}]
+         ) as phase4:
+        first = workflow.execute("Hệ thống đấu giá thời gian thực")
+        first["validation"]["errors"].append("sửa bởi caller")
+        first["happy_path"].steps.clear()
+        second = workflow.execute("Hệ thống đấu giá realtime")
+
+    assert run.call_count == 1
+    assert phase4.call_count == 2
+    assert second["phase4_export"] == {"run": 2}
+    assert second["validation"]["errors"] == []
+    assert len(second["happy_path"].steps) == 3
+
+
+def test_execute_runs_crew_when_semantic_cache_lookup_fails():
+    config = HierarchicalWorkflowConfig(
+        verbose=False,
+        memory=False,
+        enable_phase4_export=False,
+        enable_semantic_cache=True,
+    )
+    workflow = HierarchicalWorkflow(config)
+    fake_run = {"raw_output": "ok", "final_result": {}, "manager_output": None}
+    workflow._architect, workflow._auditors = object(), (object(),)
+    broken_cache = _SemanticCache()
+
+    with patch.object(hw, "_SEMANTIC_CACHE", broken_cache), \
+         patch.object(broken_cache, "get", side_effect=ValueError("shapes not aligned")), \
+         patch.object(broken_cache, "set") as cache_set, \
+         patch.object(hw, "_embed_requirement", return_value=[1.0, 0.0, 0.0]), \
+         patch.object(HierarchicalWorkflow, "_create_agents"), \
+         patch("src.tasks.create_hierarchical_tasks", return_value=[]), \
+         patch.object(workflow.orchestrator, "execute_workflow", return_value=fake_run) as run:
+        result = workflow.execute("Hệ thống đấu giá thời gian thực")
+
+    assert run.call_count == 1
+    assert cache_set.call_count == 0
+    assert "validation" in result
+
+
+def test_finalize_result_validates_through_content_cache():
+    workflow = HierarchicalWorkflow(
+        HierarchicalWorkflowConfig(verbose=False, memory=False, enable_phase4_export=False)
+    )
+    raw = {"raw_output": "ok", "final_result": {}, "manager_output": None}
+    happy_path, business, technical = hw._placeholder_results()
+    expected = hw._get_validator().validate_hierarchical_result({
+        "happy_path": happy_path,
+        "business_exceptions": business,
+        "technical_edge_cases": technical,
+    })
+
+    with patch.object(hw, "_VALIDATION_CACHE", hw.OrderedDict()), \
+         patch.object(
+             workflow.validator, "validate_hierarchical_result", wraps=workflow.validator.validate_hierarchical_result
+         ) as validate:
+        first = workflow._finalize_result(raw)
+        second = workflow._finalize_result(raw)
+
+    assert validate.call_count == 1
+    assert (first["validation"]["is_valid"], first["validation"]["errors"]) == expected
+    assert second["validation"] == first["validation"]
+
+
+def test_agents_reused_per_instance_until_cache_cleared():
+    config = HierarchicalWorkflowConfig(
+        verbose=False,
+        memory=False,
+        use_multiple_auditors=True,
+        num_auditors=2,
+    )
+
+    first = HierarchicalWorkflow(config)
+    first._create_agents()
+    architect = first.agents["architect"]
+    first._create_agents()
+    assert first.agents["architect"] is architect
+    assert first.agents["auditor_0"] is not first.agents["auditor_1"]
+    assert first.agents["auditor_0"].llm is first.agents["auditor_1"].llm
+
+    # Instance khác không dùng chung agents (CrewAI ghi state lên Agent)
+    second = HierarchicalWorkflow(config)
+    second._create_agents()
+    assert not any(first.agents[key] is second.agents[key] for key in first.agents)
+
+    # Debate agents tách riêng khỏi workers của crew
+    assert not set(map(id, first._get_debate_agents())) & set(map(id, first._workers))
+
+    first.clear_agent_cache()
+    first._create_agents()
+    assert first.agents["architect"] is not architect
+
+
+def test_validation_cached_by_content():
+    from unittest.mock import MagicMock
+
+    happy_path, business, technical = hw._placeholder_results()
+    result = {
+        "happy_path": happy_path,
+        "business_exceptions": business,
+        "technical_edge_cases": technical,
+    }
+    validator = MagicMock()
+    validator.validate_hierarchical_result.return_value = (True, ["warning"])
+
+    with patch.object(hw, "_VALIDATION_CACHE", hw.OrderedDict()):
+        first = hw._validate_cached(validator, dict(result))
+        second = hw._validate_cached(validator, dict(result, manager_summary="khác"))
+        changed = hw._validate_cached(
+            validator, dict(result, happy_path=happy_path.model_copy(update={"feature_name": "Khác"}))
+        )
+
+    assert first == second == changed == (True, ["warning"])
+    assert validator.validate_hierarchical_result.call_count == 2
+
+
+def test_parsed_results_are_independent_copies():
+    workflow = HierarchicalWorkflow(HierarchicalWorkflowConfig(verbose=False, memory=False))
+    raw = {"raw_output": "ok", "final_result": {}, "manager_output": None}
+
+    first = workflow._parse_workflow_result(raw)
+    first["happy_path"].steps.clear()
+    first["business_exceptions"].edge_cases.clear()
+    second = workflow._parse_workflow_result(raw)
+
+    assert len(second["happy_path"].steps) == 3
+    assert len(second["business_exceptions"].edge_cases) == 5
+    assert len(hw._placeholder_results()[0].steps) == 3
+
+
+def test_export_data_does_not_share_dumps_between_exports():
+    workflow = HierarchicalWorkflow(HierarchicalWorkflowConfig(verbose=False, memory=False))
+    parsed = {"happy_path": hw._placeholder_results()[0]}
+
+    first = workflow._prepare_export_data(parsed)
+    first["happy_path"].append({"step_number": 99})
+    second = workflow._prepare_export_data(parsed)
+
+    assert len(second["happy_path"]) == 3
+
+
+@pytest.mark.parametrize("force, expected_runs", [(False, 0), (True, 1)])
+def test_phase4_skipped_when_validation_fails(force, expected_runs):
+    config = HierarchicalWorkflowConfig(
+        verbose=False,
+        memory=False,
+        phase4_force_on_errors=force,
+    )
+    workflow = HierarchicalWorkflow(config)
+    raw = {"raw_output": "ok", "final_result": {}, "manager_output": None}
+
+    with patch.object(hw, "_validate_cached", return_value=(False, ["lỗi"])), \
+         patch.object(HierarchicalWorkflow, "_run_phase4_export", return_value={"success": True}) as phase4:
+        result = workflow._finalize_result(raw)
+
+    assert phase4.call_count == expected_runs
+    assert result["validation"] == {"is_valid": False, "errors": ["lỗi"]}
+    if not force:
+        assert result["phase4_export"]["skipped"] is True
+
+
+def test_phase4_reports_errors_instead_of_raising():
+    from src.aggregation import QualityGateError
+
+    workflow = HierarchicalWorkflow(HierarchicalWorkflowConfig(verbose=False, memory=False))
+    parsed = {"happy_path": hw._placeholder_results()[0]}
+
+    with patch("src.aggregation.export_sdd", side_effect=QualityGateError("QG fail")):
+        result = workflow._run_phase4_export(parsed)
+    assert result == {"success": False, "error": "QG fail"}
+
+    with patch.object(HierarchicalWorkflow, "_get_debate_agents", side_effect=RuntimeError("no LLM")):
+        result = workflow._run_phase4_export(parsed)
+    assert result == {"success": False, "error": "no LLM"}
@@ -53,3 +53,24 @@ def test_all_agents_use_llm():
     assert black.llm is not None
     assert green.llm is not None
     assert editor.llm is not None
+
+def test_get_llm_reuses_instance_for_same_config(monkeypatch):
+    """Test get_llm returns a shared instance per configuration."""
+    from src.utils.llm_provider import get_llm
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    assert get_llm("google") is get_llm("GOOGLE")
+    assert get_llm("google", temperature=0.9) is not get_llm("google")
+
+
+def test_embedder_config_cached_per_api_key(monkeypatch):
+    """Test embedder config được build một lần cho mỗi API key."""
+    from src.utils.llm_provider import get_google_gemini_embedder_config
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "key-a")
+    config = get_google_gemini_embedder_config()
+    assert get_google_gemini_embedder_config() is config
+    assert config["config"]["api_key"] == "key-a"
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "key-b")
+    assert get_google_gemini_embedder_config()["config"]["api_key"] == "key-b"
@@ -63,3 +63,43 @@ def test_export_sdd_creates_quality_report_json(tmp_path):
     json_files = list(output_dir.glob("*_quality_report.json"))
 
     assert len(json_files) >= 1
+
+
+def test_export_sdd_creates_missing_output_dir(tmp_path):
+    """Test export tạo thư mục output lồng nhau khi chưa tồn tại."""
+    data = {
+        "feature_name": "Test",
+        "happy_path": [{"action": "A", "description": "Test"}] * 5,
+        "edge_cases": [{"scenario": f"C{i}", "mitigation": "F"} for i in range(5)],
+        "tech_stack": {"A": {"rationale": "R"}},
+    }
+    output_dir = tmp_path / "nested" / "output"
+
+    result = export_sdd(
+        aggregated_data=data,
+        template="# {feature_name}",
+        output_path=str(output_dir),
+        enforce_quality_gate=False,
+    )
+
+    assert Path(result["file_path"]).parent == output_dir
+    assert Path(result["file_path"]).read_text(encoding="utf-8").startswith("# Test")
+    assert list(output_dir.glob("*_quality_report.json"))
+
+
+def test_quality_report_json_keeps_non_ascii_as_utf8(monkeypatch):
+    """orjson và fallback json chuẩn cùng ghi tiếng Việt dạng UTF-8 (không escape)."""
+    import json
+    import sys
+    from src.aggregation.export import _dump_json_bytes
+
+    data = {"summary": "Kiểm tra chất lượng", "score": 8}
+
+    dumped = _dump_json_bytes(data)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    fallback = _dump_json_bytes(data)
+
+    assert dumped == fallback
+    assert "Kiểm tra chất lượng".encode("utf-8") in dumped
+    assert json.loads(dumped) == data
+
@@ -1,6 +1,6 @@
 import pytest
 import os
-from src.tools.file_tools import read_file, list_directory, search_in_files
+from src.tools.file_tools import read_file, read_json_file, list_directory, search_in_files
 
 def test_read_file_success(tmp_path):
     # Create a temporary file
@@ -37,3 +37,75 @@ def test_search_in_files(tmp_path):
     assert "file2.txt" in result
     assert "General Kenobi" in result
     assert "file1.txt" not in result
+
+def test_search_in_files_case_insensitive(tmp_path):
+    d = tmp_path / "subdir"
+    d.mkdir()
+    (d / "file1.txt").write_text("General KENOBI\nHello there")
+    (d / "file2.txt").write_text("kenobi")
+    (d / "empty.txt").write_text("")
+
+    result = search_in_files.run(str(d), "Kenobi")
+    assert "file1.txt" in result
+    assert "file2.txt" in result
+    assert "Line 1: General KENOBI" in result
+
+    result = search_in_files.run(str(d), "Kenobi", case_sensitive=True)
+    assert "Không tìm thấy kết quả" in result
+
+def test_read_json_file_picks_up_changes(tmp_path):
+    p = tmp_path / "config.json"
+    p.write_text('{"name": "first"}', encoding="utf-8")
+    assert '"first"' in read_json_file.run(str(p))
+    assert read_json_file.run(str(p)) == read_json_file.run(str(p))
+
+    p.write_text('{"name": "second value"}', encoding="utf-8")
+    result = read_json_file.run(str(p))
+    assert '"second value"' in result
+    assert '"first"' not in result
+
+def test_search_in_files_skips_binary_files(tmp_path):
+    (tmp_path / "data.bin").write_bytes(b"\x00\x01Kenobi\x00")
+    (tmp_path / "notes.txt").write_text("General Kenobi")
+
+    result = search_in_files.run(str(tmp_path), "Kenobi")
+    assert "notes.txt" in result
+    assert "data.bin" not in result
+
+def test_read_json_file_keeps_big_ints_and_separators(tmp_path):
+    p = tmp_path / "numbers.json"
+    p.write_text('{"big": 12345678901234567890123, "exp": 1e22}', encoding="utf-8")
+
+    result = read_json_file.run(str(p), pretty=False)
+    assert '{"big": 12345678901234567890123, "exp": 1e+22}' in result
+
+def test_search_in_files_slash_pattern_matches_like_rglob(tmp_path):
+    (tmp_path / "src" / "sub").mkdir(parents=True)
+    (tmp_path / "src" / "a.py").write_text("Kenobi")
+    (tmp_path / "src" / "sub" / "deep.py").write_text("Kenobi")
+    (tmp_path / "pkg" / "src").mkdir(parents=True)
+    (tmp_path / "pkg" / "src" / "b.py").write_text("Kenobi")
+
+    result = search_in_files.run(str(tmp_path), "Kenobi", pattern="src/*.py")
+    assert os.path.join("src", "a.py") in result
+    assert os.path.join("pkg", "src", "b.py") in result
+    assert "deep.py" not in result
+
+def test_search_in_files_multiline_term_finds_nothing(tmp_path):
+    (tmp_path / "notes.txt").write_text("foo\nbar")
+
+    result = search_in_files.run(str(tmp_path), "foo\nbar")
+    assert "Không tìm thấy kết quả" in result
+
+
+def test_search_in_files_double_star_pattern_includes_root_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.py").write_text("Kenobi")
+    (tmp_path / "sub" / "b.py").write_text("Kenobi")
+    (tmp_path / "c.txt").write_text("Kenobi")
+
+    result = search_in_files.run(str(tmp_path), "Kenobi", pattern="**/*.py")
+    assert "## File: a.py" in result
+    assert os.path.join("sub", "b.py") in result
+    assert "c.txt" not in result
+
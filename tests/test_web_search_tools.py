@@ -27,3 +27,117 @@ def test_fetch_web_page(mock_fetch):
     
     result = fetch_web_page.run("http://example.com")
     assert "Page Content" in result
+
+def test_get_search_provider_env_override_is_cached(monkeypatch):
+    from src.tools.search_providers import get_search_provider, GoogleCustomSearchProvider
+
+    monkeypatch.setenv("DEEPSPEC_SEARCH_PROVIDER", "google")
+    monkeypatch.setenv("GOOGLE_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_CSE_ID", "cse")
+    get_search_provider.cache_clear()
+    try:
+        provider = get_search_provider()
+        assert isinstance(provider, GoogleCustomSearchProvider)
+        assert get_search_provider() is provider
+    finally:
+        get_search_provider.cache_clear()
+
+def test_fetch_and_parse_url_stops_reading_at_byte_cap():
+    from src.tools import web_fetcher
+
+    html = b"<html><body><main>" + b"<p>line of readable text</p>" * 50000 + b"</main></body></html>"
+    response = MagicMock(status_code=200, headers={"Content-Type": "text/html"})
+    response.__enter__.return_value = response
+    response.iter_content.return_value = (html[i:i + 65536] for i in range(0, len(html), 65536))
+    session = MagicMock()
+    session.get.return_value = response
+
+    with patch.object(web_fetcher, "get_session", return_value=session):
+        result = web_fetcher.fetch_and_parse_url("http://example.com/big", max_length=1000)
+
+    assert "line of readable text" in result
+    assert session.get.call_args.kwargs["stream"] is True
+    remaining = list(response.iter_content.return_value)
+    assert remaining  # phần lớn body không bị tải về
+
+
+def test_fetch_and_parse_url_skips_non_html():
+    from src.tools import web_fetcher
+
+    response = MagicMock(status_code=200, headers={"Content-Type": "application/pdf"})
+    response.__enter__.return_value = response
+    session = MagicMock()
+    session.get.return_value = response
+
+    with patch.object(web_fetcher, "get_session", return_value=session):
+        result = web_fetcher.fetch_and_parse_url("http://example.com/file.pdf")
+
+    assert "application/pdf" in result
+    response.iter_content.assert_not_called()
+
+def test_conditional_get_etag_cache_is_thread_safe_lru():
+    from concurrent.futures import ThreadPoolExecutor
+    from src.tools import web_fetcher
+
+    def get(url, **kwargs):
+        return MagicMock(status_code=200, headers={"ETag": f'"{url}"'}, content=url.encode())
+
+    session = MagicMock()
+    session.get.side_effect = get
+
+    with patch.object(web_fetcher, "get_session", return_value=session), \
+         patch.object(web_fetcher, "_ETAG_CACHE", web_fetcher.OrderedDict()), \
+         patch.object(web_fetcher, "_ETAG_CACHE_MAX_ENTRIES", 4):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bodies = list(executor.map(
+                lambda i: web_fetcher._conditional_get(f"http://example.com/{i}")[1], range(200)
+            ))
+        assert len(web_fetcher._ETAG_CACHE) == 4
+
+    assert bodies == [f"http://example.com/{i}".encode() for i in range(200)]
+
+@patch('src.tools.search_providers.get_search_provider')
+def test_search_with_sources_keeps_source_order(mock_get_provider):
+    import time
+    from src.tools.web_search_tools import search_with_sources
+
+    def slow_search(query, *args):
+        if "a.example" in query:
+            time.sleep(0.05)
+        return f"result for {query}"
+
+    mock_get_provider.return_value.search.side_effect = slow_search
+
+    result = search_with_sources.run("kubernetes", ["a.example", "b.example"])
+    assert result.index("## Từ a.example") < result.index("## Từ b.example")
+    assert "result for site:a.example kubernetes" in result
+    mock_get_provider.assert_called_once()
+
+@patch('src.tools.search_providers.get_search_provider')
+def test_web_search_caches_identical_queries(mock_get_provider):
+    from src.tools.web_search_tools import clear_web_cache
+
+    mock_get_provider.return_value.search.return_value = "Cached result"
+    clear_web_cache()
+    try:
+        assert web_search.run("cache me") == "Cached result"
+        assert web_search.run("cache me") == "Cached result"
+        assert mock_get_provider.return_value.search.call_count == 1
+    finally:
+        clear_web_cache()
+
+@patch('src.tools.search_providers.get_search_provider')
+def test_search_documentation_batch(mock_get_provider):
+    from src.tools.web_search_tools import search_documentation_batch, clear_web_cache
+
+    mock_get_provider.return_value.search.side_effect = lambda query, *args: f"hits for {query}"
+    clear_web_cache()
+    try:
+        results = search_documentation_batch([("redis", "streams"), ("unknowntech", "setup")])
+    finally:
+        clear_web_cache()
+
+    assert "## Từ redis.io/docs" in results[("redis", "streams")]
+    assert "hits for site:redis.io/docs streams" in results[("redis", "streams")]
+    assert results[("unknowntech", "setup")] == "hits for unknowntech setup documentation tutorial"
+    mock_get_provider.assert_called_once()